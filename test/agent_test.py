@@ -1,12 +1,35 @@
 import unittest
 
 from agent import QLearningAgent
+from cell import Cell
+from field import Field
+from frozen_field import FrozenField
 
 
 class QLearningAgentTest(unittest.TestCase):
     def test_init(self):
         agent = QLearningAgent()
 
+    def test_q_key_shared_with_mirror_image(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.S)
+        next_field = Field()
+        next_field.set_cell(22, 1, Cell.GREY)
+        state = (FrozenField(field), 0, (Cell.L, Cell.T), Cell.S, False)
+        mirrored_state = (FrozenField(field.mirror()), 0, (Cell.J, Cell.T), Cell.Z, False)
+        self.assertEqual(QLearningAgent.get_q_key(state, next_field),
+                         QLearningAgent.get_q_key(mirrored_state, next_field.mirror()))
+
+    def test_q_key_not_mirrored_for_I(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.S)
+        for queue, hold_piece in [((Cell.I, Cell.T), Cell.S), ((Cell.L, Cell.T), Cell.I)]:
+            state = (FrozenField(field), 0, queue, hold_piece, False)
+            mirrored_state = (FrozenField(field.mirror()), 0, tuple(piece.mirror() for piece in queue),
+                              hold_piece.mirror(), False)
+            self.assertNotEqual(QLearningAgent.get_q_key(state, field),
+                                QLearningAgent.get_q_key(mirrored_state, field.mirror()))
+
     def test_train_once(self):
         agent = QLearningAgent()
         agent.train_auto(1)
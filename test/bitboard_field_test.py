@@ -0,0 +1,113 @@
+import unittest
+
+from bitboard_field import BitboardField, BitboardFieldWithTetromino
+from cell import Cell
+from control import Control
+from field import Field
+from random_stacks import get_random_stacks
+from tetromino import tetromino_cells
+
+
+class BitboardFieldTest(unittest.TestCase):
+    def test_init_all_empty(self):
+        field = BitboardField()
+        for row in range(field.height):
+            self.assertTrue(field.is_row_empty(row))
+            self.assertEqual(field.get_row_bitmask(row), 0)
+            for column in range(field.width):
+                self.assertTrue(field.is_cell_empty(row, column))
+
+    def test_set_and_get_cells(self):
+        field = Field()
+        bitboard_field = BitboardField()
+        for index in range(240):
+            row, column = field.index_to_coords(index)
+            cell = Cell(index % 9)
+            field.set_cell(row, column, cell)
+            bitboard_field.set_cell(row, column, cell)
+        self.assertEqual(bitboard_field.field, field.field)
+        for row in range(field.height):
+            self.assertEqual(bitboard_field.get_row_bitmask(row), field.get_row_bitmask(row))
+        bitboard_field.set_cell(0, 1, Cell.EMPTY)
+        self.assertTrue(bitboard_field.is_cell_empty(0, 1))
+        self.assertIs(bitboard_field.get_cell(0, 2), Cell.L)
+
+    def test_line_clear(self):
+        for field in get_random_stacks(0, 20, top_rows=[Field.height - 7], density=0.5):
+            bitboard_field = BitboardField(field.field)
+            for column in range(field.width):
+                field.set_cell(20, column, Cell.T)
+                bitboard_field.set_cell(20, column, Cell.T)
+            self.assertTrue(bitboard_field.is_row_filled(20))
+            self.assertEqual(bitboard_field.line_clear(), field.line_clear())
+            self.assertEqual(bitboard_field.field, field.field)
+            self.assertEqual(hash(bitboard_field), hash(field))
+            self.assertEqual(bitboard_field.get_column_heights(), field.get_column_heights())
+            self.assertEqual(bitboard_field.get_num_nonempty_cells(), field.get_num_nonempty_cells())
+
+    def test_equality(self):
+        field_1 = BitboardField()
+        field_2 = BitboardField()
+        self.assertEqual(field_1, field_2)
+        field_1.set_cell(22, 0, Cell.I)
+        self.assertNotEqual(field_1, field_2)
+        field_2.set_cell(22, 0, Cell.J)
+        self.assertNotEqual(field_1, field_2)
+        field_2.set_cell(22, 0, Cell.I)
+        self.assertEqual(field_1, field_2)
+        self.assertEqual(hash(field_1), hash(field_2))
+        self.assertEqual(field_1, field_1.to_field())
+
+
+class BitboardFieldWithTetrominoTest(unittest.TestCase):
+    def test_spawn(self):
+        field = BitboardField()
+        field.set_cell(22, 0, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.T)
+        self.assertIsInstance(fwt, BitboardFieldWithTetromino)
+        self.assertFalse(fwt.is_cell_empty(22, 0))
+        self.assertEqual(fwt.get_tetromino_nonempty_coords(), {(1, 4), (2, 3), (2, 4), (2, 5)})
+
+    def test_hard_drop(self):
+        field = BitboardField().spawn_tetromino(Cell.I).execute_control(Control.HARD_DROP)
+        self.assertIsInstance(field, BitboardField)
+        self.assertEqual(field.get_row(field.height - 2),
+                         [Cell.EMPTY, Cell.EMPTY, Cell.EMPTY, Cell.I, Cell.I,
+                          Cell.I, Cell.I, Cell.EMPTY, Cell.EMPTY, Cell.EMPTY])
+
+    def test_offsets_valid_same_as_field(self):
+        for field in get_random_stacks(1, 5, top_rows=[Field.height - 7], density=0.5):
+            bitboard_field = BitboardField(field.field)
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell).execute_control(Control.ROTATE_CW)
+                bitboard_fwt = bitboard_field.spawn_tetromino(cell).execute_control(Control.ROTATE_CW)
+                for offset_row in range(-3, field.height + 1):
+                    for offset_column in range(-3, field.width + 1):
+                        self.assertEqual(bitboard_fwt._are_offsets_valid(offset_row, offset_column),
+                                         fwt._are_offsets_valid(offset_row, offset_column))
+
+    def test_possible_fields_same_as_field(self):
+        for field in get_random_stacks(2, 3, top_rows=[Field.height - 7], density=0.5):
+            bitboard_field = BitboardField(field.field)
+            for cell in tetromino_cells:
+                possible_fields = field.spawn_tetromino(cell).get_possible_fields()
+                bitboard_possible_fields = bitboard_field.spawn_tetromino(cell).get_possible_fields()
+                self.assertEqual({Field(f.field) for f in bitboard_possible_fields}, possible_fields)
+            pieces_to_fields = bitboard_field.get_possible_fields_of_pieces(tetromino_cells)
+            self.assertEqual({cell: {Field(f.field) for f in fields} for cell, fields in pieces_to_fields.items()},
+                             field.get_possible_fields_of_pieces(tetromino_cells))
+
+    def test_possible_fields_below_height(self):
+        field = BitboardField()
+        greys = [(19, 3), (19, 4), (20, 2), (20, 3), (20, 4), (20, 5), (20, 6), (20, 7), (21, 4), (21, 5), (22, 3),
+                 (22, 4)]
+        for row, column in greys:
+            field.set_cell(row, column, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.I)
+        self.assertEqual(9, len(fwt.get_possible_fields_below_height(4)))
+        fwt = field.spawn_tetromino(Cell.O)
+        self.assertEqual(5, len(fwt.get_possible_fields_below_height(4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,14 @@ class CellTest(unittest.TestCase):
             else:
                 self.assertFalse(cell.is_empty())
 
+    def test_mirror(self):
+        self.assertIs(Cell.L.mirror(), Cell.J)
+        self.assertIs(Cell.S.mirror(), Cell.Z)
+        for cell in Cell:
+            self.assertIs(cell.mirror().mirror(), cell)
+        for cell in [Cell.EMPTY, Cell.I, Cell.O, Cell.T, Cell.GREY]:
+            self.assertIs(cell.mirror(), cell)
+
 
 if __name__ == '__main__':
     unittest.main()
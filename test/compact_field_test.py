@@ -0,0 +1,105 @@
+import pickle
+import struct
+import sys
+import unittest
+from copy import deepcopy
+
+from cell import Cell
+from compact_field import CompactField, CompactFieldWithTetromino
+from control import Control
+from field import Field
+from random_stacks import NONEMPTY_CELLS, get_random_stacks
+from tetromino import tetromino_cells
+
+
+class CompactFieldTest(unittest.TestCase):
+    def test_init_all_empty(self):
+        field = CompactField()
+        self.assertEqual(len(field.cells), 240)
+        for row in range(field.height):
+            self.assertTrue(field.is_row_empty(row))
+            for column in range(field.width):
+                self.assertTrue(field.is_cell_empty(row, column))
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(CompactField(), "__dict__"))
+
+    def test_flat_index(self):
+        field = Field()
+        compact_field = CompactField()
+        for index in range(240):
+            row, column = field.index_to_coords(index)
+            cell = Cell(index % 9)
+            field.set_cell(row, column, cell)
+            compact_field.set_cell(row, column, cell)
+            self.assertEqual(compact_field.cells[index], cell.value)
+        self.assertEqual(compact_field.field, field.field)
+        self.assertEqual(compact_field, CompactField(field.field))
+        self.assertEqual(compact_field.to_field(), field)
+
+    def test_buffer(self):
+        field = CompactField()
+        field.set_cell(22, 9, Cell.T)
+        self.assertEqual(struct.unpack_from("B", field.buffer, 229)[0], Cell.T.value)
+        self.assertEqual(field.buffer.tobytes(), bytes(field.cells))
+
+    @unittest.skipIf(sys.version_info < (3, 12), "The buffer protocol for Python classes requires Python 3.12")
+    def test_buffer_protocol(self):
+        field = CompactField()
+        field.set_cell(22, 9, Cell.T)
+        self.assertEqual(struct.unpack_from("B", memoryview(field), 229)[0], Cell.T.value)
+
+    def test_copies_are_independent(self):
+        field = CompactField()
+        for copied_field in [field.copy_field(), deepcopy(field)]:
+            copied_field.set_cell(0, 0, Cell.GREY)
+            self.assertTrue(field.is_cell_empty(0, 0))
+            self.assertNotEqual(field, copied_field)
+
+    def test_pickle(self):
+        field = CompactField()
+        field.set_cell(22, 3, Cell.Z)
+        self.assertEqual(pickle.loads(pickle.dumps(field)), field)
+        fwt = field.spawn_tetromino(Cell.J)
+        self.assertEqual(pickle.loads(pickle.dumps(fwt)), fwt)
+
+    def test_line_clear(self):
+        for field in get_random_stacks(0, 20, top_rows=[12], bottom_row=Field.height - 1, density=0.8,
+                                       cells=NONEMPTY_CELLS):
+            compact_field = CompactField(field.field)
+            self.assertEqual(compact_field.line_clear(), field.line_clear())
+            self.assertEqual(compact_field.field, field.field)
+            self.assertEqual(hash(compact_field), hash(field))
+            self.assertEqual(compact_field.get_column_heights(), field.get_column_heights())
+            self.assertEqual(compact_field.get_num_nonempty_cells(), field.get_num_nonempty_cells())
+
+
+class CompactFieldWithTetrominoTest(unittest.TestCase):
+    def test_deepcopy_shares_tetromino(self):
+        fwt = CompactField().spawn_tetromino(Cell.S)
+        self.assertIsInstance(fwt, CompactFieldWithTetromino)
+        copied_fwt = deepcopy(fwt)
+        self.assertIs(copied_fwt.tetromino, fwt.tetromino)
+        self.assertEqual(copied_fwt, fwt)
+        copied_fwt.set_cell(22, 0, Cell.GREY)
+        self.assertTrue(fwt.is_cell_empty(22, 0))
+
+    def test_hard_drop(self):
+        field = CompactField().spawn_tetromino(Cell.O).execute_control(Control.HARD_DROP)
+        self.assertIsInstance(field, CompactField)
+        self.assertNotIsInstance(field, CompactFieldWithTetromino)
+        self.assertEqual(field.get_row_bitmask(field.height - 2), 0b110000)
+
+    def test_possible_fields_same_as_field(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (22, 5), (21, 0), (21, 9), (20, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        compact_field = CompactField(field.field)
+        for cell in tetromino_cells:
+            possible_fields = field.spawn_tetromino(cell).get_possible_fields()
+            compact_possible_fields = compact_field.spawn_tetromino(cell).get_possible_fields()
+            self.assertEqual({f.to_field() for f in compact_possible_fields}, possible_fields)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from copy import deepcopy
+
+from cell import Cell
+from control import Control
+from copy_on_write_field import CopyOnWriteField, CopyOnWriteFieldWithTetromino
+from field import Field
+from tetromino import tetromino_cells
+
+
+class CopyOnWriteFieldTest(unittest.TestCase):
+    def test_copy_shares_rows(self):
+        field = CopyOnWriteField()
+        copied_field = field.copy_field()
+        for row in range(field.height):
+            self.assertIs(copied_field.get_row(row), field.get_row(row))
+
+    def test_writes_do_not_leak(self):
+        field = CopyOnWriteField()
+        field.set_cell(22, 0, Cell.GREY)
+        copied_field = deepcopy(field)
+        copied_field.set_cell(22, 1, Cell.GREY)
+        field.set_cell(21, 1, Cell.GREY)
+        self.assertTrue(field.is_cell_empty(22, 1))
+        self.assertTrue(copied_field.is_cell_empty(21, 1))
+        self.assertFalse(copied_field.is_cell_empty(22, 0))
+        self.assertIsNot(copied_field.get_row(22), field.get_row(22))
+        self.assertIs(copied_field.get_row(20), field.get_row(20))
+
+    def test_line_clear_keeps_sharing(self):
+        field = CopyOnWriteField()
+        for column in range(field.width):
+            field.set_cell(22, column, Cell.GREY)
+        field.set_cell(21, 0, Cell.I)
+        copied_field = field.copy_field()
+        self.assertEqual(copied_field.line_clear(), 1)
+        self.assertIs(copied_field.get_row(22), field.get_row(21))
+        copied_field.set_cell(22, 1, Cell.I)
+        self.assertTrue(field.is_cell_empty(21, 1))
+        self.assertTrue(field.is_row_filled(22))
+        self.assertEqual(field.line_clear(), 1)
+        copied_field.set_cell(22, 1, Cell.EMPTY)
+        self.assertEqual(field, copied_field)
+
+    def test_equal_to_field(self):
+        field = Field()
+        field.set_cell(22, 4, Cell.T)
+        self.assertEqual(CopyOnWriteField(field.field), field)
+        self.assertEqual(hash(CopyOnWriteField(field.field)), hash(field))
+
+
+class CopyOnWriteFieldWithTetrominoTest(unittest.TestCase):
+    def test_placement_copies_touched_rows_only(self):
+        field = CopyOnWriteField()
+        fwt = field.spawn_tetromino(Cell.I)
+        self.assertIsInstance(fwt, CopyOnWriteFieldWithTetromino)
+        new_field = fwt.execute_control(Control.HARD_DROP)
+        self.assertIsInstance(new_field, CopyOnWriteField)
+        self.assertNotIsInstance(new_field, CopyOnWriteFieldWithTetromino)
+        for row in range(field.height):
+            if row == field.height - 2:
+                self.assertIsNot(new_field.get_row(row), field.get_row(row))
+            else:
+                self.assertIs(new_field.get_row(row), field.get_row(row))
+        self.assertTrue(field.is_visibly_empty())
+
+    def test_possible_fields_same_as_field(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (22, 5), (21, 0), (21, 9), (20, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        copy_on_write_field = CopyOnWriteField(field.field)
+        for cell in tetromino_cells:
+            possible_fields = field.spawn_tetromino(cell).get_possible_fields()
+            self.assertEqual(copy_on_write_field.spawn_tetromino(cell).get_possible_fields(), possible_fields)
+        self.assertEqual(copy_on_write_field, field)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from cell import Cell
+from field import Field
+from random_stacks import NONEMPTY_CELLS, get_random_stacks
+from tetromino import tetromino_cells
+
+try:
+    from field_batch import FieldBatch
+except ImportError:
+    FieldBatch = None
+
+
+@unittest.skipIf(FieldBatch is None, "NumPy is not installed")
+class FieldBatchTest(unittest.TestCase):
+    def test_round_trip(self):
+        fields = get_random_stacks(0, 20, bottom_row=Field.height - 1, density=0.8, cells=NONEMPTY_CELLS)
+        batch = FieldBatch.from_fields(fields)
+        self.assertEqual(batch.cells.shape, (20, 24, 10))
+        self.assertEqual(batch.to_fields(), fields)
+        self.assertEqual(batch[3], fields[3])
+        self.assertEqual(batch[2:5].to_fields(), fields[2:5])
+        self.assertEqual(FieldBatch.from_fumen(batch.to_fumen()).to_fields(), fields)
+        self.assertEqual(len(FieldBatch()), 0)
+
+    def test_queries_match_field(self):
+        fields = get_random_stacks(1, 20, bottom_row=Field.height - 1, density=0.8, cells=NONEMPTY_CELLS) + [Field()]
+        batch = FieldBatch.from_fields(fields)
+        self.assertEqual(batch.get_column_heights().tolist(), [list(f.get_column_heights()) for f in fields])
+        self.assertEqual(batch.get_row_counts().tolist(), [f.row_counts for f in fields])
+        self.assertEqual(batch.get_num_nonempty_cells().tolist(), [f.get_num_nonempty_cells() for f in fields])
+        self.assertEqual(batch.is_visibly_empty().tolist(), [f.is_visibly_empty() for f in fields])
+        self.assertEqual(batch.get_bottommost_visible_empty_row().tolist(),
+                         [f.get_bottommost_visible_empty_row() for f in fields])
+        self.assertEqual(batch.get_zobrist_hashes().tolist(), [f.zobrist_hash for f in fields])
+
+    def test_line_clear(self):
+        fields = get_random_stacks(2, 20, bottom_row=Field.height - 1, density=0.8, cells=NONEMPTY_CELLS)
+        batch = FieldBatch.from_fields(fields)
+        lines_cleared = batch.line_clear()
+        self.assertEqual(lines_cleared.tolist(), [f.line_clear() for f in fields])
+        self.assertEqual(batch.to_fields(), fields)
+
+    def test_convert_cells_to_grey(self):
+        fields = get_random_stacks(3, 5, bottom_row=Field.height - 1, density=0.8, cells=NONEMPTY_CELLS)
+        grey_batch = FieldBatch.from_fields(fields).convert_cells_to_grey()
+        self.assertEqual(grey_batch.to_fields(), [f.convert_cells_to_grey() for f in fields])
+
+    def test_unique(self):
+        fields = set()
+        for cell in tetromino_cells:
+            fields |= Field().spawn_tetromino(cell).get_possible_fields()
+        batch = FieldBatch.from_fields(list(fields) * 2)
+        self.assertEqual(set(batch.unique().to_fields()), fields)
+        self.assertEqual(len(batch.unique()), len(fields))
+        grey_fields = {field.convert_cells_to_grey() for field in fields}
+        self.assertEqual(len(batch.convert_cells_to_grey().unique()), len(grey_fields))
+
+
+if __name__ == '__main__':
+    unittest.main()
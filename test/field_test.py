@@ -1,16 +1,70 @@
+import pickle
 import unittest
 from copy import deepcopy
+from random import Random
 
 from cell import Cell
 from control import Control
 from field import Field, FieldWithTetromino
+from random_stacks import get_random_stacks
 from rotation import Rotation
 from rotation_system import SuperRotationSystem
-from tetromino import Tetromino
+from tetromino import Tetromino, tetromino_cells
+from utils import bfs
 
 SRS = SuperRotationSystem
 
 
+def get_possible_fields_by_fwt_bfs(fwt):
+    """
+    Return the possible Fields of FWT by searching over FieldWithTetrominos, as get_possible_fields used to.
+    Hard drops are soft drops repeated row by row.
+    """
+    def hard_drop(fwt):
+        new_fwt = fwt._execute_soft_drop()
+        return fwt if new_fwt == fwt else hard_drop(new_fwt)
+
+    list_of_actions = [
+        lambda fwt: fwt._execute_move_left(),
+        lambda fwt: fwt._execute_move_right(),
+        lambda fwt: fwt._execute_soft_drop(),
+        hard_drop,
+        lambda fwt: fwt._execute_rotate_cw(),
+        lambda fwt: fwt._execute_rotate_ccw()
+    ]
+    return {fwt._place_tetromino_and_line_clear()[0] for fwt in bfs(fwt, list_of_actions) if fwt.is_valid_placement()}
+
+
+# Controls of a T-Spin Double on the Field of get_tsd_field
+TSD_CONTROLS = [Control.MOVE_RIGHT] * 4 + [Control.ROTATE_CCW] + [Control.SOFT_DROP] * 18 + \
+               [Control.ROTATE_CCW, Control.HARD_DROP]
+
+
+def get_tsd_field():
+    """Return the Field of an opening with a T-Spin Double slot."""
+    field = Field()
+    for cell, controls in [
+        (Cell.I, [Control.HARD_DROP]),
+        (Cell.L, [Control.ROTATE_CW, Control.ROTATE_CW, Control.MOVE_LEFT, Control.HARD_DROP]),
+        (Cell.Z, [Control.ROTATE_CW, Control.MOVE_RIGHT, Control.HARD_DROP]),
+        (Cell.J, [Control.ROTATE_CCW] + [Control.MOVE_RIGHT] * 5 + [Control.HARD_DROP]),
+        (Cell.O, [Control.MOVE_LEFT] * 4 + [Control.HARD_DROP]),
+        (Cell.S, [Control.HARD_DROP])
+    ]:
+        field = field.spawn_tetromino(cell).execute_controls(controls)
+    return field
+
+
+def get_low_stack_field():
+    """Return a Field with a low stack that Tetrominos rotating just above it kick off."""
+    field = Field()
+    for row, pattern in enumerate(["#..#.#...#", "###.#.....", "#.########", ".#..#...##", "..####...."], 18):
+        for column, char in enumerate(pattern):
+            if char == "#":
+                field.set_cell(row, column, Cell.GREY)
+    return field
+
+
 class FieldTest(unittest.TestCase):
     def test_init_all_empty(self):
         field = Field()
@@ -66,6 +120,59 @@ class FieldTest(unittest.TestCase):
                 self.assertTrue(field.is_row_empty(row))
 
 
+    def test_line_clear_given_rows(self):
+        field = Field()
+        for row in [18, 20, 21]:
+            for column in range(field.width):
+                field.set_cell(row, column, Cell.GREY)
+        field.set_cell(19, 0, Cell.T)
+        field.set_cell(22, 9, Cell.T)
+        self.assertEqual(field.line_clear([19, 20, 21, 22]), 2)
+        self.assertEqual(field.row_counts[20], field.width)
+        self.assertIs(field.get_cell(21, 0), Cell.T)
+        self.assertIs(field.get_cell(22, 9), Cell.T)
+        self.assertTrue(field.is_row_empty(19))
+        self.assertEqual(field.line_clear(), 1)
+        self.assertEqual(field.row_counts, Field(field.field).row_counts)
+        self.assertEqual(hash(field), hash(Field(field.field)))
+
+    def test_row_counts(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.I)
+        field.set_cell(22, 1, Cell.I)
+        field.set_cell(22, 1, Cell.GREY)
+        self.assertEqual(field.row_counts[22], 2)
+        field.set_cell(22, 0, Cell.EMPTY)
+        self.assertEqual(field.row_counts[22], 1)
+        self.assertEqual(sum(field.row_counts), 1)
+
+    def test_column_heights(self):
+        field = Field()
+        field.set_cell(23, 0, Cell.GREY)
+        field.set_cell(20, 1, Cell.I)
+        field.set_cell(22, 1, Cell.I)
+        self.assertEqual(field.get_column_heights(), (0, 3, 0, 0, 0, 0, 0, 0, 0, 0))
+        field.set_cell(20, 1, Cell.EMPTY)
+        self.assertEqual(field.get_column_height(1), 1)
+        self.assertEqual(field.get_num_nonempty_cells(), 2)
+        self.assertEqual(field.get_row_count(23), 1)
+
+    def test_occupancy_counters_match_recount(self):
+        random = Random(0)
+        field = Field()
+        for _ in range(500):
+            row = random.randrange(10, field.height)
+            field.set_cell(row, random.randrange(field.width), Cell(random.randrange(9)))
+            if random.random() < 0.1:
+                for column in range(field.width):
+                    field.set_cell(row, column, Cell.GREY)
+                field.line_clear()
+            recounted_field = Field(field.field)
+            self.assertEqual(field.get_column_heights(), recounted_field.get_column_heights())
+            self.assertEqual(field.row_counts, recounted_field.row_counts)
+            self.assertEqual(field.get_num_nonempty_cells(), recounted_field.get_num_nonempty_cells())
+
+
 class FieldEqualityTest(unittest.TestCase):
     def test_init_equality(self):
         field_1 = Field()
@@ -82,6 +189,98 @@ class FieldEqualityTest(unittest.TestCase):
                 field_2.set_cell(row, column, cell)
         self.assertEqual(field_1, field_2)
 
+    def test_equality_across_field_types(self):
+        from bitboard_field import BitboardField
+        from compact_field import CompactField
+        from copy_on_write_field import CopyOnWriteField
+        from frozen_field import FrozenField
+        field = Field()
+        for row, column, cell in [(22, 0, Cell.J), (22, 1, Cell.GREY), (21, 5, Cell.T), (0, 9, Cell.I)]:
+            field.set_cell(row, column, cell)
+        other_field = Field(field.field)
+        other_field.set_cell(21, 5, Cell.S)
+        fields = [field, BitboardField(field.field), CompactField(field.field), CopyOnWriteField(field.field),
+                  FrozenField(field)]
+        for field_1 in fields:
+            self.assertNotEqual(field_1, other_field)
+            for field_2 in fields:
+                self.assertEqual(field_1, field_2)
+                self.assertEqual(hash(field_1), hash(field_2))
+
+
+class FieldHashTest(unittest.TestCase):
+    def test_init_hash(self):
+        self.assertEqual(hash(Field()), 0)
+        field = Field()
+        field.set_cell(22, 0, Cell.GREY)
+        self.assertEqual(hash(Field(field.field)), hash(field))
+        field.set_cell(22, 0, Cell.EMPTY)
+        self.assertEqual(hash(field), 0)
+
+    def test_incremental_hash(self):
+        random = Random(0)
+        field = Field()
+        for _ in range(200):
+            cell = random.choice(sorted(tetromino_cells, key=lambda cell: cell.value))
+            fwt = field.spawn_tetromino(cell)
+            controls = [random.choice([Control.MOVE_LEFT, Control.MOVE_RIGHT, Control.ROTATE_CW]) for _ in range(3)]
+            field = fwt.execute_controls(controls + [Control.HARD_DROP])
+            self.assertEqual(hash(field), hash(Field(field.field)))
+            if not field.is_row_empty(3):
+                field = Field()
+
+    def test_line_clear_hash(self):
+        field = Field()
+        for row in [20, 22]:
+            for column in range(field.width):
+                field.set_cell(row, column, Cell.GREY)
+        field.set_cell(21, 0, Cell.I)
+        field.set_cell(19, 5, Cell.T)
+        self.assertEqual(field.line_clear(), 2)
+        self.assertEqual(hash(field), hash(Field(field.field)))
+
+    def test_hash_in_sets(self):
+        field_1 = Field()
+        field_1.set_cell(22, 0, Cell.S)
+        field_2 = Field()
+        field_2.set_cell(22, 0, Cell.Z)
+        self.assertNotEqual(hash(field_1), hash(field_2))
+        field_2.set_cell(22, 0, Cell.S)
+        self.assertEqual(len({field_1, field_2, field_1.copy_field()}), 1)
+
+
+class FieldPickleTest(unittest.TestCase):
+    def test_grey_field(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (21, 9), (0, 5), (23, 3)]:
+            field.set_cell(row, column, Cell.GREY)
+        self.assertEqual(len(field.to_bytes()), 30)
+        self.assertEqual(Field.from_bytes(field.to_bytes()), field)
+        self.assertEqual(pickle.loads(pickle.dumps(field)), field)
+
+    def test_coloured_field(self):
+        random = Random(0)
+        field = Field()
+        for _ in range(50):
+            field.set_cell(random.randrange(field.height), random.randrange(field.width), Cell(random.randrange(9)))
+        unpickled_field = pickle.loads(pickle.dumps(field))
+        self.assertEqual(unpickled_field, field)
+        self.assertEqual(unpickled_field.get_column_heights(), field.get_column_heights())
+
+    def test_field_with_tetromino(self):
+        fwt = Field().spawn_tetromino(Cell.L).execute_controls([Control.ROTATE_CW, Control.MOVE_LEFT])
+        unpickled_fwt = pickle.loads(pickle.dumps(fwt))
+        self.assertIsInstance(unpickled_fwt, FieldWithTetromino)
+        self.assertEqual(unpickled_fwt, fwt)
+        self.assertEqual(unpickled_fwt.get_possible_fields(), fwt.get_possible_fields())
+
+    def test_deepcopy_shares_tetromino(self):
+        fwt = Field().spawn_tetromino(Cell.T)
+        copied_fwt = deepcopy(fwt)
+        self.assertIs(copied_fwt.tetromino, fwt.tetromino)
+        copied_fwt.set_cell(22, 0, Cell.GREY)
+        self.assertTrue(fwt.is_cell_empty(22, 0))
+
 
 class FieldConvertToGreyTest(unittest.TestCase):
     def test_init_convert_nothing(self):
@@ -120,6 +319,56 @@ class FieldIsVisiblyEmptyTest(unittest.TestCase):
         self.assertFalse(field.is_visibly_empty())
 
 
+class FieldMirrorTest(unittest.TestCase):
+    def test_mirror(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.L)
+        field.set_cell(21, 1, Cell.T)
+        mirrored_field = field.mirror()
+        self.assertIs(mirrored_field.get_cell(22, 9), Cell.J)
+        self.assertIs(mirrored_field.get_cell(21, 8), Cell.T)
+        self.assertEqual(mirrored_field.get_num_nonempty_cells(), 2)
+        self.assertEqual(mirrored_field.mirror(), field)
+
+    def test_canonical_form(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.S)
+        canonical_field, is_mirrored = field.get_canonical_form()
+        mirrored_canonical_field, is_mirrored_mirrored = field.mirror().get_canonical_form()
+        self.assertEqual(canonical_field, mirrored_canonical_field)
+        self.assertNotEqual(is_mirrored, is_mirrored_mirrored)
+        self.assertEqual(Field().get_canonical_form(), (Field(), False))
+
+    def test_mirrored_possible_fields(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (22, 5), (21, 0), (21, 9), (20, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        for cell in [Cell.T, Cell.L, Cell.S, Cell.O]:
+            possible_fields = field.spawn_tetromino(cell).get_possible_fields()
+            mirrored_possible_fields = field.mirror().spawn_tetromino(cell.mirror()).get_possible_fields()
+            self.assertEqual({f.mirror() for f in possible_fields}, mirrored_possible_fields)
+
+
+class FieldWithTetrominoLineClearTest(unittest.TestCase):
+    def test_hard_drop_lines_cleared(self):
+        field = Field()
+        for column in range(field.width - 1):
+            field.set_cell(22, column, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.I).execute_control(Control.ROTATE_CW)
+        fwt = fwt.execute_controls([Control.MOVE_RIGHT for _ in range(4)])
+        new_field, lines_cleared = fwt.execute_control(Control.HARD_DROP, ignore_lines_cleared=False)
+        self.assertEqual(lines_cleared, 1)
+        self.assertEqual(new_field.row_counts[22], 1)
+        self.assertIsInstance(fwt.execute_control(Control.HARD_DROP), Field)
+
+    def test_moves_do_not_clear_lines(self):
+        field = Field()
+        for column in range(field.width):
+            field.set_cell(22, column, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.O).execute_control(Control.MOVE_LEFT)
+        self.assertTrue(fwt.is_row_filled(22))
+
+
 class FieldWithTetrominoInitTest(unittest.TestCase):
     def test_I_spawn_position(self):
         I = Tetromino.get(Cell.I, SRS.get_spawn_rotation())
@@ -400,6 +649,49 @@ class FieldWithTetrominoHardDropTest(unittest.TestCase):
         new_coords = new_field.get_tetromino_nonempty_coords()
         self.assertEqual(new_coords, coords)
 
+    def test_T_hard_drop_below_overhang(self):
+        T = Tetromino.get(Cell.T, Rotation.SOUTH)
+        field = FieldWithTetromino(T)
+        for column in range(2, 7):
+            field.set_cell(15, column, Cell.GREY)
+        field.set_cell(22, 4, Cell.GREY)
+        field.offset_row = 14
+        self.assertTrue(field.are_current_offsets_valid())
+        new_field = field._execute_hard_drop()
+        self.assertEqual(new_field.get_tetromino_nonempty_coords(), {(20, 3), (20, 4), (20, 5), (21, 4)})
+
+    def test_hard_drop_from_blocked_spawn(self):
+        field = Field()
+        field.set_cell(2, 4, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.T)
+        self.assertFalse(fwt.are_current_offsets_valid())
+        self.assertEqual(fwt._execute_hard_drop().offset_row, fwt.offset_row)
+        new_field = fwt.execute_control(Control.HARD_DROP)
+        self.assertEqual({(row, column) for row in range(new_field.height) for column in range(new_field.width)
+                          if new_field.get_cell(row, column) is Cell.T}, {(1, 4), (2, 3), (2, 4), (2, 5)})
+
+        # A blocked Tetromino with a free row below falls as a valid one does
+        field = Field()
+        field.set_cell(1, 4, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.O)
+        self.assertFalse(fwt.are_current_offsets_valid())
+        self.assertEqual(fwt._execute_hard_drop().get_tetromino_nonempty_coords(),
+                         {(21, 4), (21, 5), (22, 4), (22, 5)})
+
+    def test_hard_drop_same_as_soft_drops(self):
+        for field in get_random_stacks(1, 5):
+            for cell in tetromino_cells:
+                for rotation in Rotation:
+                    for offset_column in range(-2, field.width):
+                        fwt = FieldWithTetromino(Tetromino.get(cell, rotation), field.field)
+                        fwt.offset_column = offset_column
+                        if not fwt.are_current_offsets_valid():
+                            continue
+                        soft_dropped_fwt = fwt
+                        while soft_dropped_fwt._execute_soft_drop() != soft_dropped_fwt:
+                            soft_dropped_fwt = soft_dropped_fwt._execute_soft_drop()
+                        self.assertEqual(fwt._execute_hard_drop(), soft_dropped_fwt)
+
 
 class FieldWithTetrominoRotateCWTest(unittest.TestCase):
     def test_I_rotate_CW(self):
@@ -1368,6 +1660,134 @@ class FieldWithTetrominoGetPossibleFieldsTest(unittest.TestCase):
         fwt = field.spawn_tetromino(Cell.O)
         self.assertEqual(9, len(fwt.get_possible_fields()))
 
+    def test_convert_to_grey_same_as_converting_each_field(self):
+        field = Field()
+        for row, column, cell in [(22, 0, Cell.J), (22, 1, Cell.J), (22, 5, Cell.S), (21, 0, Cell.GREY),
+                                  (22, 6, Cell.I), (22, 7, Cell.I), (22, 8, Cell.I), (22, 9, Cell.I)]:
+            field.set_cell(row, column, cell)
+        for cell in tetromino_cells:
+            fwt = field.spawn_tetromino(cell)
+            grey_fields = fwt.get_possible_fields(convert_to_grey=True)
+            self.assertEqual(grey_fields, {f.convert_cells_to_grey() for f in fwt.get_possible_fields()})
+            for grey_field in grey_fields:
+                self.assertEqual(grey_field, grey_field.convert_cells_to_grey())
+
+
+    def test_same_as_searching_over_field_with_tetrominos(self):
+        for field in get_random_stacks(0, 4):
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell)
+                self.assertEqual(fwt.get_possible_fields(), get_possible_fields_by_fwt_bfs(fwt))
+
+    def test_T_spin_double(self):
+        fwt = get_tsd_field().spawn_tetromino(Cell.T)
+        tsd_field = fwt.execute_controls(TSD_CONTROLS)
+        possible_fields = fwt.get_possible_fields()
+        self.assertIn(tsd_field, possible_fields)
+        self.assertEqual(possible_fields, get_possible_fields_by_fwt_bfs(fwt))
+
+    def test_obstructed_spawn(self):
+        field = Field()
+        for row in range(2, field.height - 1):
+            field.set_cell(row, 4, Cell.GREY)
+            field.set_cell(row, 5, Cell.GREY)
+        for cell in tetromino_cells:
+            fwt = field.spawn_tetromino(cell)
+            self.assertFalse(fwt.are_current_offsets_valid())
+            self.assertEqual(fwt.get_possible_fields(), get_possible_fields_by_fwt_bfs(fwt))
+
+
+class FieldGetPossibleFieldsOfPiecesTest(unittest.TestCase):
+    def test_same_as_spawning_each_piece(self):
+        for field in get_random_stacks(6, 3) + [Field(), get_tsd_field()]:
+            for convert_to_grey, hard_drop_only in [(False, False), (True, False), (True, True)]:
+                pieces_to_fields = field.get_possible_fields_of_pieces(tetromino_cells, convert_to_grey, hard_drop_only)
+                self.assertEqual(pieces_to_fields,
+                                 {cell: field.spawn_tetromino(cell).get_possible_fields(convert_to_grey, hard_drop_only)
+                                  for cell in tetromino_cells})
+
+    def test_no_pieces(self):
+        self.assertEqual(Field().get_possible_fields_of_pieces([]), dict())
+
+
+class FieldWithTetrominoGetPossibleFieldsWithControlsTest(unittest.TestCase):
+    def test_controls_give_fields(self):
+        for field in get_random_stacks(2, 3) + [Field()]:
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell)
+                fields_to_controls = fwt.get_possible_fields_with_controls()
+                self.assertEqual(set(fields_to_controls), fwt.get_possible_fields())
+                for new_field, controls in fields_to_controls.items():
+                    self.assertIs(controls[-1], Control.HARD_DROP)
+                    self.assertNotIn(Control.HARD_DROP, controls[:-1])
+                    self.assertEqual(fwt.execute_controls(controls), new_field)
+
+    def test_rotating_above_low_stack(self):
+        # Soft dropping T onto this stack before searching used to lose every rotation that kicks off the stack
+        fwt = get_low_stack_field().spawn_tetromino(Cell.T)
+        fields_to_controls = fwt.get_possible_fields_with_controls()
+        self.assertEqual(set(fields_to_controls), fwt.get_possible_fields())
+        self.assertIn(fwt.execute_controls([Control.MOVE_LEFT, Control.ROTATE_CW, Control.HARD_DROP]),
+                      fwt.get_possible_fields())
+
+    def test_shortest_controls(self):
+        fwt = Field().spawn_tetromino(Cell.T)
+        fields_to_controls = fwt.get_possible_fields_with_controls(convert_to_grey=True)
+        spawn_field = fwt.execute_control(Control.HARD_DROP).convert_cells_to_grey()
+        self.assertEqual(fields_to_controls[spawn_field], [Control.HARD_DROP])
+        left_field = fwt.execute_controls([Control.MOVE_LEFT] * 3 + [Control.HARD_DROP]).convert_cells_to_grey()
+        self.assertEqual(fields_to_controls[left_field], [Control.MOVE_LEFT] * 3 + [Control.HARD_DROP])
+        # Without ROTATE_180, T needs two rotations to be upside down
+        flat_field = fwt.execute_controls([Control.ROTATE_CW] * 2 + [Control.HARD_DROP]).convert_cells_to_grey()
+        self.assertEqual(len(fields_to_controls[flat_field]), 3)
+
+    def test_fewest_rotations(self):
+        fwt = Field().spawn_tetromino(Cell.I)
+        fields_to_controls = fwt.get_possible_fields_with_controls()
+        for controls in fields_to_controls.values():
+            self.assertLessEqual(sum(control in {Control.ROTATE_CW, Control.ROTATE_CCW} for control in controls), 1)
+
+    def test_T_spin_double_controls(self):
+        field = get_tsd_field()
+        fwt = field.spawn_tetromino(Cell.T)
+        tsd_field = fwt.execute_controls(TSD_CONTROLS)
+        controls = fwt.get_possible_fields_with_controls()[tsd_field]
+        self.assertEqual(fwt.execute_controls(controls), tsd_field)
+        self.assertLess(len(controls), len(TSD_CONTROLS))
+
+
+class FieldWithTetrominoHardDropOnlyTest(unittest.TestCase):
+    def test_same_as_rotating_shifting_and_hard_dropping(self):
+        rotation_controls = [[], [Control.ROTATE_CW], [Control.ROTATE_CCW], [Control.ROTATE_CW] * 2]
+        shift_controls = [[control] * shifts for control in [Control.MOVE_LEFT, Control.MOVE_RIGHT]
+                          for shifts in range(Field.width)]
+        for field in get_random_stacks(3, 3) + [Field()]:
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell)
+                expected_fields = {fwt.execute_controls(rotations + shifts + [Control.HARD_DROP])
+                                   for rotations in rotation_controls for shifts in shift_controls}
+                self.assertEqual(fwt.get_possible_fields(hard_drop_only=True), expected_fields)
+
+    def test_no_tucks_or_spins(self):
+        fwt = get_tsd_field().spawn_tetromino(Cell.T)
+        tsd_field = fwt.execute_controls(TSD_CONTROLS)
+        hard_drop_fields = fwt.get_possible_fields(hard_drop_only=True)
+        self.assertNotIn(tsd_field, hard_drop_fields)
+        self.assertLess(hard_drop_fields, fwt.get_possible_fields())
+        self.assertEqual(fwt.get_possible_fields(convert_to_grey=True, hard_drop_only=True),
+                         {f.convert_cells_to_grey() for f in hard_drop_fields})
+
+    def test_empty_field(self):
+        for cell in tetromino_cells:
+            fwt = Field().spawn_tetromino(cell)
+            self.assertEqual(fwt.get_possible_fields(hard_drop_only=True), fwt.get_possible_fields())
+
+    def test_subset_of_default(self):
+        for field in get_random_stacks(4, 3) + [get_low_stack_field()]:
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell)
+                self.assertLessEqual(fwt.get_possible_fields(hard_drop_only=True), fwt.get_possible_fields())
+
 
 class FieldWithTetrominoGetPossibleFieldsBelowHeightTest(unittest.TestCase):
     def test_screwed_field(self):
@@ -1381,6 +1801,27 @@ class FieldWithTetrominoGetPossibleFieldsBelowHeightTest(unittest.TestCase):
         fwt = field.spawn_tetromino(Cell.O)
         self.assertEqual(5, len(fwt.get_possible_fields_below_height(4)))
 
+    def test_same_as_filtering_possible_fields(self):
+        for field in get_random_stacks(4, 6) + [Field()]:
+            for cell in tetromino_cells:
+                fwt = field.spawn_tetromino(cell)
+                possible_fields = fwt.get_possible_fields(convert_to_grey=True)
+                for height in [2, 4, 6, 10, 30]:
+                    self.assertEqual(fwt.get_possible_fields_below_height(height, convert_to_grey=True),
+                                     {f for f in possible_fields
+                                      if f.get_bottommost_visible_empty_row() + height + 2 >= f.height})
+
+    def test_too_high_to_clear_down(self):
+        field = Field()
+        for row in range(12, field.height - 1):
+            for column in range(field.width - 1):
+                field.set_cell(row, column, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.I)
+        self.assertEqual(fwt._get_possible_placement_states(height=4), set())
+        self.assertEqual(fwt.get_possible_fields_below_height(4), set())
+        # The vertical I clears four rows, which is still too high for height 4 but not for height 7
+        self.assertEqual(len(fwt.get_possible_fields_below_height(7)), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import gc
+import pickle
+import unittest
+from copy import deepcopy
+
+from cell import Cell
+from control import Control
+from field import Field
+from frozen_field import FrozenField
+from game import Game
+
+
+class FrozenFieldTest(unittest.TestCase):
+    def test_interned(self):
+        field = Field()
+        field.set_cell(22, 4, Cell.O)
+        frozen_field = FrozenField(field)
+        self.assertIs(FrozenField(field), frozen_field)
+        self.assertIs(FrozenField(field.field), frozen_field)
+        self.assertIs(FrozenField(frozen_field), frozen_field)
+        self.assertIs(deepcopy(frozen_field), frozen_field)
+        self.assertIs(pickle.loads(pickle.dumps(frozen_field)), frozen_field)
+        self.assertIsNot(FrozenField(), frozen_field)
+
+    def test_canonical_form_computed_once(self):
+        field = Field()
+        field.set_cell(22, 0, Cell.S)
+        frozen_field = FrozenField(field)
+        canonical_field, is_mirrored = frozen_field.get_canonical_form()
+        self.assertIsInstance(canonical_field, FrozenField)
+        self.assertEqual((canonical_field, is_mirrored), field.get_canonical_form())
+        self.assertIs(frozen_field.get_canonical_form()[0], canonical_field)
+
+    def test_released_when_unused(self):
+        field = Field()
+        field.set_cell(0, 0, Cell.Z)
+        zobrist_hash = hash(FrozenField(field))
+        gc.collect()
+        self.assertNotIn(zobrist_hash, FrozenField.interned)
+
+    def test_immutable(self):
+        frozen_field = FrozenField()
+        with self.assertRaises(TypeError):
+            frozen_field.set_cell(0, 0, Cell.I)
+        with self.assertRaises(TypeError):
+            frozen_field.line_clear()
+        with self.assertRaises(TypeError):
+            frozen_field.field = Field().field
+        with self.assertRaises(TypeError):
+            frozen_field.get_row(0)[0] = Cell.I
+        self.assertTrue(frozen_field.is_visibly_empty())
+
+    def test_equal_to_field(self):
+        field = Field()
+        field.set_cell(22, 9, Cell.J)
+        frozen_field = FrozenField(field)
+        self.assertEqual(frozen_field, field)
+        self.assertEqual(field, frozen_field)
+        self.assertEqual(hash(frozen_field), hash(field))
+        self.assertIn(field, {frozen_field})
+        self.assertIn(frozen_field, {field})
+        self.assertNotEqual(FrozenField(), field)
+
+    def test_spawn_tetromino(self):
+        frozen_field = FrozenField()
+        new_field = frozen_field.spawn_tetromino(Cell.T).execute_control(Control.HARD_DROP)
+        self.assertFalse(new_field.is_visibly_empty())
+        self.assertTrue(frozen_field.is_visibly_empty())
+        self.assertEqual(len(frozen_field.spawn_tetromino(Cell.T).get_possible_fields()), 34)
+        self.assertIsInstance(new_field.convert_cells_to_grey(), Field)
+        self.assertIsInstance(FrozenField(new_field).convert_cells_to_grey(), FrozenField)
+
+
+class FrozenFieldGameTest(unittest.TestCase):
+    def test_history_is_frozen(self):
+        game = Game(seed=0)
+        game.advance_to_field(next(iter(game.next_fields - {game.field})))
+        self.assertTrue(all(isinstance(field, FrozenField) for field in game.history))
+        self.assertIs(game.get_state_representation()[0], game.history[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
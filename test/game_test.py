@@ -1,7 +1,12 @@
+import pickle
 import unittest
 
+from cell import Cell
+from field import Field
 from fumen import Fumen
-from game import Game, PCMode
+from control import Control
+from frozen_field import FrozenField
+from game import Game, GameWithControls, PCMode
 from random import Random
 
 
@@ -17,6 +22,75 @@ class GameTest(unittest.TestCase):
         print(game)
         print(Fumen.encode(game.history))
 
+    def test_iter_possible_next_fields(self):
+        game = Game(seed=3)
+        random = Random(3)
+        for _ in range(8):
+            next_fields = list(game.iter_possible_next_fields())
+            self.assertEqual(len(next_fields), len(set(next_fields)))
+            self.assertEqual(set(next_fields), game.get_possible_next_fields())
+            self.assertEqual(game.get_num_possible_next_fields(), len(next_fields))
+            self.assertEqual(next(game.iter_possible_next_fields()) == game.field, not game.has_held_once)
+            game.advance_to_field(random.choice(sorted(game.next_fields, key=hash)))
+
+
+    def test_num_possible_next_fields_with_same_line_clears(self):
+        field = Field()
+        for row, pattern in enumerate(["#######...", "#######...", "####.#####", "####.#.#.#", "####.###.."], 18):
+            for column, char in enumerate(pattern):
+                if char == "#":
+                    field.set_cell(row, column, Cell.GREY)
+        game = Game(seed=0)
+        game.field = FrozenField(field)
+        game.queue[0] = Cell.T
+        for has_held_once in [False, True]:
+            game.has_held_once = has_held_once
+            self.assertEqual(game.get_num_possible_next_fields(), len(game.get_possible_next_fields()))
+
+class GamePickleTest(unittest.TestCase):
+    def test_pickle(self):
+        game = Game(seed=1)
+        random = Random(1)
+        for _ in range(5):
+            game.advance_to_field(random.choice(sorted(game.next_fields, key=hash)))
+        unpickled_game = pickle.loads(pickle.dumps(game))
+        self.assertEqual(unpickled_game.get_state_representation(), game.get_state_representation())
+        self.assertEqual(unpickled_game.next_fields, game.next_fields)
+        self.assertEqual(list(unpickled_game.history), list(game.history))
+
+    def test_pickle_settings(self):
+        game = Game(seed=1)
+        game.queue_visibility = 3
+        game.is_hold_enabled = False
+        unpickled_game = pickle.loads(pickle.dumps(game))
+        self.assertEqual(unpickled_game.queue_visibility, 3)
+        self.assertFalse(unpickled_game.is_hold_enabled)
+        self.assertEqual(unpickled_game.queue, game.queue)
+
+    def test_pickle_game_with_controls(self):
+        game = GameWithControls()
+        unpickled_game = pickle.loads(pickle.dumps(game))
+        self.assertIsNone(unpickled_game.fwt)
+        game.spawn_tetromino()
+        game.execute_controls([Control.MOVE_LEFT, Control.ROTATE_CW])
+        unpickled_game = pickle.loads(pickle.dumps(game))
+        self.assertEqual(unpickled_game.fwt, game.fwt)
+        self.assertEqual(unpickled_game.get_state_representation(), game.get_state_representation())
+        unpickled_game.execute_control(Control.HARD_DROP)
+        game.execute_control(Control.HARD_DROP)
+        self.assertEqual(unpickled_game.field, game.field)
+
+
+class GameWithControlsTest(unittest.TestCase):
+    def test_play_possible_fields_with_controls(self):
+        random = Random(3)
+        game = GameWithControls()
+        for _ in range(8):
+            fields_to_controls = game.get_possible_fields_with_controls()
+            field = random.choice(sorted(fields_to_controls, key=hash))
+            game.execute_controls(fields_to_controls[field])
+            self.assertEqual(game.field, field)
+
 
 class PCModeTest(unittest.TestCase):
     def test_full_game(self):
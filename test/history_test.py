@@ -0,0 +1,74 @@
+import unittest
+from random import Random
+
+from cell import Cell
+from control import Control
+from field import Field
+from frozen_field import FrozenField
+from fumen import Fumen
+from game import Game
+from history import CHECKPOINT_INTERVAL, FieldHistory, get_placement_delta
+
+
+class FieldHistoryTest(unittest.TestCase):
+    def test_game_history(self):
+        game = Game(seed=0)
+        random = Random(0)
+        fields = [game.field]
+        while not game.has_game_ended and len(fields) < 40 and game.next_fields - {game.field}:
+            field = random.choice(sorted(game.next_fields - {game.field}, key=hash))
+            game.advance_to_field(field)
+            fields.append(field)
+        self.assertEqual(list(game.history), fields)
+        self.assertEqual(len(game.history), len(fields))
+        self.assertEqual(game.history[5], fields[5])
+        self.assertEqual(game.history[-2], fields[-2])
+        self.assertEqual(game.history[1:3], fields[1:3])
+        self.assertEqual(game.history.to_fumen(), Fumen.encode(fields))
+        self.assertTrue(all(not isinstance(delta, FrozenField) for delta in game.history.deltas))
+
+    def test_index_from_checkpoints(self):
+        field = Field()
+        history = FieldHistory(field)
+        fields = [FrozenField(field)]
+        for i in range(3 * CHECKPOINT_INTERVAL + 5):
+            field = Field(field.field)
+            field.set_cell(22 - i // 10 % 20, i % 10, Cell.GREY if i % 3 else Cell.T)
+            history.append(field)
+            fields.append(FrozenField(field))
+        self.assertEqual(len(history.checkpoints), 4)
+        self.assertEqual([history[i] for i in range(len(history))], fields)
+        for index in [slice(None), slice(3, 70, 4), slice(CHECKPOINT_INTERVAL, None), slice(-5, None), slice(None, -3),
+                      slice(None, None, -2), slice(200, None), slice(5, 2)]:
+            self.assertEqual(history[index], fields[index])
+
+    def test_line_clear_delta(self):
+        field = Field()
+        for column in range(field.width - 1):
+            field.set_cell(22, column, Cell.GREY)
+            field.set_cell(21, column, Cell.GREY)
+        field.set_cell(20, 0, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.I).execute_control(Control.ROTATE_CW)
+        next_field = fwt.execute_controls([Control.MOVE_RIGHT for _ in range(4)] + [Control.HARD_DROP])
+        placed_cells, cleared_rows = get_placement_delta(field, next_field)
+        self.assertEqual(cleared_rows, (21, 22))
+        self.assertEqual(len(placed_cells), 4)
+
+        history = FieldHistory(field)
+        history.append(next_field)
+        self.assertEqual(list(history), [field, next_field])
+
+    def test_unrelated_field_kept_whole(self):
+        field = Field()
+        next_field = Field()
+        for row in range(18, 23):
+            field.set_cell(row, 0, Cell.GREY)
+            next_field.set_cell(row, 0, Cell.T)
+        history = FieldHistory(field)
+        history.append(next_field)
+        self.assertIsInstance(history.deltas[0], FrozenField)
+        self.assertEqual(list(history), [field, next_field])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from cell import Cell
+from field import Field
+from pc_field import PCField, TOP_ROW
+from tetromino import tetromino_cells
+
+
+class PCFieldTest(unittest.TestCase):
+    def test_round_trip(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (21, 0), (19, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        pc_field = PCField.from_field(field)
+        self.assertEqual(pc_field.bits, 1 << 30 | 1 << 31 | 1 << 20 | 1 << 9)
+        self.assertEqual(pc_field.to_field(), field)
+        self.assertEqual(PCField.from_fumen(pc_field.to_fumen()), pc_field)
+
+    def test_too_high(self):
+        field = Field()
+        field.set_cell(TOP_ROW, 0, Cell.GREY)
+        self.assertTrue(PCField.fits(field))
+        field.set_cell(TOP_ROW - 1, 0, Cell.GREY)
+        self.assertFalse(PCField.fits(field))
+        with self.assertRaises(ValueError):
+            PCField.from_field(field)
+
+    def test_line_clear(self):
+        pc_field = PCField(0b1111111111 << 30 | 0b1 << 20 | 0b1111111111 << 10 | 0b11)
+        self.assertEqual(pc_field.line_clear(), (PCField(0b1 << 30 | 0b11 << 20), 2))
+        self.assertEqual(PCField().line_clear(), (PCField(), 0))
+
+    def test_possible_fields_same_as_field(self):
+        fields = [Field()]
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (22, 2), (22, 5), (22, 6), (22, 9), (21, 0), (21, 9), (20, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        fields.append(field)
+        field = Field()
+        for column in range(field.width - 1):
+            field.set_cell(22, column, Cell.GREY)
+            field.set_cell(21, column + 1, Cell.GREY)
+        fields.append(field)
+        for field in fields:
+            for cell in tetromino_cells:
+                possible_fields = field.spawn_tetromino(cell).get_possible_fields_below_height(4, convert_to_grey=True)
+                pc_possible_fields = PCField.from_field(field).get_possible_fields(cell)
+                self.assertEqual({pc_field.to_field() for pc_field in pc_possible_fields}, possible_fields)
+
+    def test_perfect_clear(self):
+        field = Field()
+        for column in range(field.width - 4):
+            field.set_cell(22, column, Cell.GREY)
+        self.assertIn(PCField(), PCField.from_field(field).get_possible_fields(Cell.I))
+
+
+if __name__ == '__main__':
+    unittest.main()
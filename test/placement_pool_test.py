@@ -0,0 +1,58 @@
+import unittest
+from random import Random
+
+from cell import Cell
+from database import pc_mode_fetch_possible_next_fields_of_many
+from field import Field
+from frozen_field import FrozenField
+from game import Game
+from placement_pool import PlacementPool
+from random_stacks import NONEMPTY_CELLS, get_random_stacks
+from tetromino import tetromino_cells
+
+
+def get_random_jobs(seed, n):
+    """Return N (Field, Cell) jobs with random low stacks of coloured Cells."""
+    random = Random(seed)
+    pieces = sorted(tetromino_cells, key=lambda cell: cell.value)
+    return [(field, random.choice(pieces))
+            for field in get_random_stacks(seed, n, top_rows=range(16, 23), cells=NONEMPTY_CELLS)]
+
+
+class PlacementPoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = PlacementPool(max_workers=2, chunk_size=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_same_as_get_possible_fields(self):
+        jobs = get_random_jobs(0, 10) + [(FrozenField(), Cell.T)]
+        self.assertEqual(self.pool.get_possible_fields(jobs),
+                         [field.spawn_tetromino(cell).get_possible_fields() for field, cell in jobs])
+        self.assertEqual(self.pool.get_possible_fields(jobs, convert_to_grey=True, height=4),
+                         [field.spawn_tetromino(cell).get_possible_fields_below_height(4, convert_to_grey=True)
+                          for field, cell in jobs])
+        self.assertEqual(self.pool.get_possible_fields([]), [])
+
+    def test_games(self):
+        games = [Game(seed=seed) for seed in range(4)]
+        random = Random(4)
+        for game in games:
+            for _ in range(random.randrange(3)):
+                game.advance_to_field(random.choice(sorted(game.next_fields, key=hash)))
+        self.assertEqual(self.pool.get_possible_next_fields_of_games(games),
+                         [game.get_possible_next_fields() for game in games])
+
+    def test_pc_mode_fetch_possible_next_fields_of_many(self):
+        jobs = [(field.convert_cells_to_grey(), cell) for field, cell in get_random_jobs(1, 6)]
+        jobs += [(jobs[0][0].mirror(), jobs[0][1].mirror()), jobs[1]]
+        self.assertEqual(pc_mode_fetch_possible_next_fields_of_many(jobs, self.pool),
+                         [field.spawn_tetromino(cell).get_possible_fields_below_height(4, convert_to_grey=True)
+                          for field, cell in jobs])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from cell import Cell
+from field import Field
+from placement_search import get_symmetries
+from rotation import Rotation
+from rotation_system import SuperRotationSystem
+from tetromino import Tetromino, tetromino_cells
+
+
+class GetSymmetriesTest(unittest.TestCase):
+    def test_srs(self):
+        o_symmetries = get_symmetries(Cell.O, SuperRotationSystem)
+        self.assertEqual({symmetric_rotation for symmetric_rotation, _, _ in o_symmetries.values()},
+                         {Rotation.SOUTH})
+        self.assertEqual(set(o_symmetries), set(Rotation) - {Rotation.SOUTH})
+        # I, S and Z cover the same Cells in opposite Rotations but kick differently
+        for cell in tetromino_cells - {Cell.O}:
+            self.assertEqual(get_symmetries(cell, SuperRotationSystem), dict())
+
+    def test_same_cells(self):
+        for rotation, (symmetric_rotation, row_change, column_change) in \
+                get_symmetries(Cell.O, SuperRotationSystem).items():
+            fwt = Field().spawn_tetromino(Cell.O)
+            self.assertEqual(fwt._get_state_nonempty_coords((Tetromino.get(Cell.O, rotation), 10, 4)),
+                             fwt._get_state_nonempty_coords((Tetromino.get(Cell.O, symmetric_rotation),
+                                                             10 + row_change, 4 + column_change)))
+
+    def test_O_searched_in_one_rotation(self):
+        fwt = Field().spawn_tetromino(Cell.O)
+        self.assertEqual({rotation for rotation, _, _ in fwt._get_possible_placement_states()}, {Rotation.SOUTH.value})
+        self.assertEqual(len(fwt.get_possible_fields()), 9)
+        for new_field, controls in fwt.get_possible_fields_with_controls().items():
+            self.assertEqual(fwt.execute_controls(controls), new_field)
+
+
+if __name__ == '__main__':
+    unittest.main()
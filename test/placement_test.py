@@ -0,0 +1,89 @@
+import pickle
+import unittest
+
+from cell import Cell
+from field import Field
+from placement import Placement
+from rotation import Rotation
+from tetromino import tetromino_cells
+
+
+class PlacementTest(unittest.TestCase):
+    def test_equal_by_occupied_cells(self):
+        placement = Placement(Cell.I, Rotation.NORTH, 20, 3)
+        self.assertEqual(placement, Placement(Cell.I, Rotation.SOUTH, 20, 4))
+        self.assertEqual(hash(placement), hash(Placement(Cell.I, Rotation.SOUTH, 20, 4)))
+        self.assertNotEqual(placement, Placement(Cell.I, Rotation.NORTH, 20, 4))
+        self.assertEqual(placement.get_nonempty_coords(), {(22, 4), (22, 5), (22, 6), (22, 7)})
+        self.assertEqual(placement.cells_mask, 0b1111 << 224)
+
+    def test_pickle(self):
+        placement = Placement(Cell.T, Rotation.EAST, 19, -1)
+        unpickled_placement = pickle.loads(pickle.dumps(placement))
+        self.assertEqual(unpickled_placement, placement)
+        self.assertEqual(unpickled_placement.rotation, Rotation.EAST)
+
+
+class FieldWithTetrominoPlacementTest(unittest.TestCase):
+    def test_placements_give_possible_fields(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (22, 2), (21, 0), (22, 6), (22, 7), (22, 8), (22, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        for cell in tetromino_cells:
+            fwt = field.spawn_tetromino(cell)
+            placements = fwt.get_possible_placements()
+            self.assertLessEqual(len(placements), len(fwt._get_possible_placement_states()))
+            self.assertEqual({fwt.get_placement_field(placement) for placement in placements},
+                             fwt.get_possible_fields())
+            self.assertEqual({fwt.get_placement_field(placement, convert_to_grey=True) for placement in placements},
+                             fwt.get_possible_fields(convert_to_grey=True))
+
+    def test_iter_possible_placements(self):
+        field = Field()
+        for row, column in [(22, 0), (22, 1), (21, 0), (20, 0), (22, 5), (22, 6), (21, 6), (22, 9)]:
+            field.set_cell(row, column, Cell.GREY)
+        for cell in tetromino_cells:
+            fwt = field.spawn_tetromino(cell)
+            for hard_drop_only in [False, True]:
+                placements = list(fwt.iter_possible_placements(hard_drop_only))
+                self.assertEqual(len(placements), len(set(placements)))
+                self.assertEqual(set(placements), fwt.get_possible_placements(hard_drop_only))
+                self.assertEqual(len(placements), fwt.get_num_possible_placements(hard_drop_only))
+                fields = list(fwt.iter_possible_fields(convert_to_grey=True, hard_drop_only=hard_drop_only))
+                self.assertEqual(len(fields), len(set(fields)))
+                self.assertEqual(set(fields), fwt.get_possible_fields(True, hard_drop_only))
+            self.assertEqual(set(fwt.iter_possible_placements(height=2)), fwt.get_possible_placements(height=2))
+
+    def test_num_possible_fields(self):
+        field = Field()
+        for row, pattern in enumerate(["#######...", "#######...", "####.#####", "####.#.#.#", "####.###.."], 18):
+            for column, char in enumerate(pattern):
+                if char == "#":
+                    field.set_cell(row, column, Cell.GREY)
+        fwt = field.spawn_tetromino(Cell.T)
+        # Two Placements of T clear lines down to the same Field
+        self.assertEqual(fwt.get_num_possible_fields(), len(fwt.get_possible_fields()))
+        self.assertLess(fwt.get_num_possible_fields(), fwt.get_num_possible_placements())
+        for cell in tetromino_cells:
+            fwt = field.spawn_tetromino(cell)
+            for convert_to_grey, hard_drop_only in [(False, False), (True, False), (True, True)]:
+                self.assertEqual(fwt.get_num_possible_fields(convert_to_grey, hard_drop_only),
+                                 len(fwt.get_possible_fields(convert_to_grey, hard_drop_only)))
+
+    def test_iter_stops_early(self):
+        fwt = Field().spawn_tetromino(Cell.T)
+        placements = fwt.iter_possible_placements()
+        first_placement = next(placements)
+        self.assertIn(first_placement, fwt.get_possible_placements())
+        self.assertEqual(len(list(placements)), 33)
+
+    def test_empty_field(self):
+        # Every rotation of O, and both horizontal or both vertical rotations of I and S, cover the same Cells
+        for cell, num_states, num_placements in [(Cell.I, 34, 17), (Cell.O, 9, 9), (Cell.S, 34, 17), (Cell.T, 34, 34)]:
+            fwt = Field().spawn_tetromino(cell)
+            self.assertEqual(len(fwt._get_possible_placement_states()), num_states)
+            self.assertEqual(len(fwt.get_possible_placements()), num_placements)
+
+
+if __name__ == '__main__':
+    unittest.main()
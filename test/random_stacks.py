@@ -0,0 +1,29 @@
+from random import Random
+
+from cell import Cell
+from field import Field
+
+NONEMPTY_CELLS = tuple(cell for cell in sorted(Cell, key=lambda cell: cell.value) if not cell.is_empty())
+
+
+def get_random_stacks(seed, n, top_rows=range(12, 21), bottom_row=Field.height - 2, density=None,
+                      cells=(Cell.GREY,)):
+    """
+    Return N Fields with random stacks from a random row of TOP_ROWS down to BOTTOM_ROW.
+    Each Cell of the stacks is nonempty with probability DENSITY, so rows may be full.
+    If DENSITY is None, each row has a random number of nonempty Cells short of a full row, leaving overhangs.
+    Nonempty Cells are random Cells of CELLS.
+    """
+    random = Random(seed)
+    fields = []
+    for _ in range(n):
+        field = Field()
+        for row in range(random.choice(top_rows), bottom_row + 1):
+            if density is None:
+                columns = random.sample(range(field.width), random.randrange(3, field.width))
+            else:
+                columns = [column for column in range(field.width) if random.random() < density]
+            for column in columns:
+                field.set_cell(row, column, random.choice(cells))
+        fields.append(field)
+    return fields
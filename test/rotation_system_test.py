@@ -3,8 +3,8 @@ import unittest
 from cell import Cell
 from control import Control
 from rotation import Rotation
-from rotation_system import subtract_lists_of_offsets, SuperRotationSystem
-from tetromino import Tetromino
+from rotation_system import ROTATION_DIRECTIONS, subtract_lists_of_offsets, SuperRotationSystem
+from tetromino import Tetromino, tetromino_cells
 
 SRS = SuperRotationSystem
 
@@ -39,5 +39,26 @@ class RotationSystemKicksTest(unittest.TestCase):
             self.assertEqual(ccw_kicks, JLSTZ_kicks[(rotation, rotation.rotate_ccw())])
 
 
+class RotationSystemKickTableTest(unittest.TestCase):
+    def test_same_as_kick_tests(self):
+        kick_table = SRS.get_kick_table()
+        self.assertIs(SRS.get_kick_table(), kick_table)
+        self.assertIsNone(kick_table[Cell.EMPTY.value])
+        self.assertIsNone(kick_table[Cell.GREY.value])
+        for cell in tetromino_cells:
+            for rotation in Rotation:
+                tetromino = Tetromino.get(cell, rotation)
+                for direction, control in enumerate(ROTATION_DIRECTIONS):
+                    new_rotation, kicks = kick_table[cell.value][rotation.value][direction]
+                    self.assertEqual(new_rotation, tetromino.rotate(control).rotation.value)
+                    self.assertEqual([(column_kick, row_kick) for row_kick, column_kick in kicks],
+                                     SRS.get_kick_tests(tetromino, control))
+
+    def test_T_north_cw(self):
+        new_rotation, kicks = SRS.get_kick_table()[Cell.T.value][Rotation.NORTH.value][0]
+        self.assertEqual(new_rotation, Rotation.EAST.value)
+        self.assertEqual(kicks, ((0, 0), (0, -1), (-1, -1), (2, 0), (2, -1)))
+
+
 if __name__ == '__main__':
     unittest.main()
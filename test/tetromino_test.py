@@ -3,7 +3,7 @@ import unittest
 from cell import Cell
 from control import Control
 from rotation import Rotation
-from tetromino import Tetromino
+from tetromino import MASK_WIDTH, Tetromino, tetromino_cells
 
 
 class TetrominoInitTest(unittest.TestCase):
@@ -357,5 +357,27 @@ class TetrominoRotate180Test(unittest.TestCase):
         self.assertEqual(I, I_maware)
 
 
+class TetrominoMaskTest(unittest.TestCase):
+    def test_T_NORTH_masks(self):
+        T = Tetromino.get(Cell.T, Rotation.NORTH)
+        self.assertEqual(T.row_masks, ((1, 0b100), (2, 0b1110)))
+        self.assertEqual(T.bounding_box, (1, 2, 1, 3))
+        self.assertEqual(T.mask, 0b100 << MASK_WIDTH | 0b1110 << 2 * MASK_WIDTH)
+        self.assertEqual(T.skirt, ((1, 2), (2, 2), (3, 2)))
+
+    def test_S_EAST_skirt(self):
+        S = Tetromino.get(Cell.S, Rotation.EAST)
+        self.assertEqual(S.skirt, ((2, 2), (3, 3)))
+
+    def test_masks_match_coords(self):
+        for cell in tetromino_cells:
+            for rotation in Rotation:
+                tetromino = Tetromino.get(cell, rotation)
+                coords = tetromino.get_nonempty_coords()
+                self.assertEqual({(row, column) for row, row_mask in tetromino.row_masks for column in range(5)
+                                  if row_mask >> column & 1}, coords)
+                self.assertEqual(tetromino.mask, sum(1 << row * MASK_WIDTH + column for row, column in coords))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,7 @@
 from random import Random
 
+from cell import Cell
 from database import pc_mode_load_q_values, pc_mode_save_q_values
-from fumen import Fumen
 from game import PCMode
 
 
@@ -30,11 +30,28 @@ class QLearningAgent(Agent):
     # Value storage #
     #################
 
+    @staticmethod
+    def get_q_key(state, next_field):
+        """
+        Return the key of STATE and NEXT_FIELD in my Q-values.
+        A state and next Field share their key with their mirror images, see Field.get_canonical_form,
+        unless I can be placed next because its SRS kicks are not mirror-symmetric.
+        """
+        field, num_pieces_placed, queue, hold_piece, has_held_once = state
+        if queue[0] is Cell.I or hold_piece is Cell.I and not has_held_once:
+            return state, next_field
+        canonical_field, is_mirrored = field.get_canonical_form()
+        if not is_mirrored:
+            return state, next_field
+        canonical_state = (canonical_field, num_pieces_placed, tuple(piece.mirror() for piece in queue),
+                           hold_piece.mirror(), has_held_once)
+        return canonical_state, next_field.mirror()
+
     def get_q_value(self, state, next_field):
-        return self.q_values.setdefault((state, next_field), 0)
+        return self.q_values.setdefault(self.get_q_key(state, next_field), 0)
 
     def set_q_value(self, state, next_field, value):
-        self.q_values[(state, next_field)] = value
+        self.q_values[self.get_q_key(state, next_field)] = value
 
     def load_q_values(self):
         self.q_values = pc_mode_load_q_values()
@@ -96,7 +113,7 @@ class QLearningAgent(Agent):
                 episode_rewards += reward
 
             accumulated_rewards += episode_rewards
-            self.episodes.append(Fumen.encode(game.history))
+            self.episodes.append(game.history.to_fumen())
 
         self.q_values = {k: v for k, v in self.q_values.items() if v != 0}
         pc_mode_save_q_values(self.q_values)
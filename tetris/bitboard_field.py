@@ -0,0 +1,166 @@
+from cell import Cell
+from field import Field, FieldWithTetromino, ZOBRIST_KEYS
+from rotation_system import SuperRotationSystem
+from tetromino import Tetromino
+
+# Row bitmask with all 10 columns occupied
+FULL_ROW = (1 << Field.width) - 1
+
+
+class BitboardField(Field):
+    """
+    A Field whose occupancy is held as 24 integer row bitmasks, one per row from top to bottom.
+    Bit i of a row bitmask is set if and only if the Cell in column i is nonempty.
+    Colours are kept in a side table of 24 integers holding 4 bits per Cell (Cell.value of column i at bits 4i to 4i+3).
+
+    Behaves like a Field while collision tests, row checks, line clears and comparisons are integer operations.
+    """
+
+    def __init__(self, field=None):
+        """
+        Initialise my bitmasks from FIELD, a list of lists of Cells.
+        If FIELD is not provided, initialise an empty BitboardField.
+        """
+        self.rows = [0] * self.height
+        self.colours = [0] * self.height
+        self.zobrist_hash = 0
+        if field is not None:
+            for row in range(self.height):
+                for column in range(self.width):
+                    self.set_cell(row, column, field[row][column])
+
+    @property
+    def field(self):
+        """A list of lists of Cells equivalent to my bitmasks. Modifying it does NOT modify me."""
+        return [self.get_row(row) for row in range(self.height)]
+
+    def __eq__(self, other):
+        """Return True if the OTHER field has the same Cells as mine."""
+        assert isinstance(other, Field)
+        if isinstance(other, BitboardField):
+            return self.rows == other.rows and self.colours == other.colours
+        return super().__eq__(other)
+
+    __hash__ = Field.__hash__
+
+    ##############################
+    # Individual Cell operations #
+    ##############################
+
+    def get_cell(self, row, column):
+        return Cell((self.colours[row] >> 4 * column) & 15)
+
+    def set_cell(self, row, column, cell):
+        assert isinstance(cell, Cell)
+        shift = 4 * column
+        keys = ZOBRIST_KEYS[row * self.width + column]
+        self.zobrist_hash ^= keys[(self.colours[row] >> shift) & 15] ^ keys[cell.value]
+        self.colours[row] = self.colours[row] & ~(15 << shift) | cell.value << shift
+        if cell.is_empty():
+            self.rows[row] &= ~(1 << column)
+        else:
+            self.rows[row] |= 1 << column
+
+    def is_cell_empty(self, row, column):
+        return not self.rows[row] >> column & 1
+
+    ##################
+    # Row operations #
+    ##################
+
+    def get_row(self, row):
+        """Return a new list of the Cells in ROW. Modifying it does NOT modify me."""
+        assert 0 <= row < self.height
+        colours = self.colours[row]
+        return [Cell((colours >> 4 * column) & 15) for column in range(self.width)]
+
+    def get_row_bitmask(self, row):
+        """Return the bitmask of nonempty Cells in ROW."""
+        return self.rows[row]
+
+    def is_row_empty(self, row):
+        return not self.rows[row]
+
+    def is_row_filled(self, row):
+        return self.rows[row] == FULL_ROW
+
+    def line_clear(self, rows=None):
+        if rows is None:
+            rows = range(self.height)
+        filled = sorted(row for row in set(rows) if self.rows[row] == FULL_ROW)
+        if filled:
+            stop_row = filled[-1] + 1
+            old_key = self._get_rows_zobrist_key(stop_row)
+            kept = [row for row in range(self.height) if row not in filled]
+            self.rows = [0] * len(filled) + [self.rows[row] for row in kept]
+            self.colours = [0] * len(filled) + [self.colours[row] for row in kept]
+            self.zobrist_hash ^= old_key ^ self._get_rows_zobrist_key(stop_row)
+        return len(filled)
+
+    ######################
+    # Occupancy counters #
+    ######################
+
+    def get_column_height(self, column):
+        return self._compute_column_height(column)
+
+    def get_column_heights(self):
+        return tuple(self._compute_column_height(column) for column in range(self.width))
+
+    def get_row_count(self, row):
+        return bin(self.rows[row]).count("1")
+
+    def get_num_nonempty_cells(self):
+        return sum(bin(row_mask).count("1") for row_mask in self.rows)
+
+    def _compute_column_height(self, column):
+        column_mask = 1 << column
+        for row in range(self.height - 1):
+            if self.rows[row] & column_mask:
+                return self.height - 1 - row
+        return 0
+
+    #################################
+    # Convert to FieldWithTetromino #
+    #################################
+
+    def spawn_tetromino(self, cell, rotation_system=SuperRotationSystem):
+        tetromino = Tetromino.get(cell, rotation_system.get_spawn_rotation())
+        fwt = BitboardFieldWithTetromino(tetromino, None, rotation_system)
+        fwt.rows, fwt.colours = list(self.rows), list(self.colours)
+        fwt.zobrist_hash = self.zobrist_hash
+        return fwt
+
+    ###########
+    # Utility #
+    ###########
+
+    def copy_field(self):
+        new_field = BitboardField()
+        self._copy_cells_to(new_field)
+        return new_field
+
+    def _copy_cells_to(self, new_field):
+        new_field.rows, new_field.colours = list(self.rows), list(self.colours)
+        new_field.zobrist_hash = self.zobrist_hash
+
+    def to_field(self):
+        """Return an equivalent Field of Cells."""
+        return Field(self.field)
+
+
+class BitboardFieldWithTetromino(FieldWithTetromino, BitboardField):
+    """
+    A BitboardField with a Tetromino yet to be placed.
+    Collision tests are masked ANDs against my row bitmasks, see field.are_offsets_valid.
+    """
+
+    def __eq__(self, other):
+        assert isinstance(other, FieldWithTetromino)
+        if not isinstance(other, BitboardFieldWithTetromino):
+            return super().__eq__(other)
+        return self.rows == other.rows and self.colours == other.colours and self.tetromino == other.tetromino and \
+            (self.offset_row, self.offset_column) == (other.offset_row, other.offset_column) and \
+            self.rotation_system == other.rotation_system
+
+    __hash__ = FieldWithTetromino.__hash__
@@ -31,4 +31,11 @@ class Cell(Enum):
 
     def is_empty(self):
         """Return True if I am EMPTY or False otherwise."""
-        return self is Cell.EMPTY
\ No newline at end of file
+        return self is Cell.EMPTY
+
+    def mirror(self):
+        """Return the Cell of my left-right mirror image. L and J are swapped, S and Z are swapped."""
+        return MIRRORED_CELLS.get(self, self)
+
+
+MIRRORED_CELLS = {Cell.L: Cell.J, Cell.J: Cell.L, Cell.S: Cell.Z, Cell.Z: Cell.S}
\ No newline at end of file
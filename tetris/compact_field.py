@@ -0,0 +1,190 @@
+from cell import Cell
+from field import Field, FieldWithTetromino, ZOBRIST_KEYS
+from rotation_system import SuperRotationSystem
+from tetromino import Tetromino
+
+# Cells indexed by value
+CELLS = tuple(Cell)
+
+# Number of Cells in a Field
+FIELD_SIZE = Field.width * Field.height
+
+
+class CompactField(Field):
+    """
+    A Field backed by a single 240-byte bytearray of Cell values.
+    The Cell at row and column is stored at index row * 10 + column, matching Field.index_to_coords.
+
+    Copying is a single slice of my bytearray. My BUFFER is a memoryview of my bytes
+    so NumPy or struct consumers can read them without a copy, e.g. numpy.frombuffer(field.buffer, numpy.uint8).
+    From Python 3.12 (PEP 688), I support the buffer protocol myself and memoryview(field) works too.
+    """
+    __slots__ = ("cells",)
+
+    def __init__(self, field=None):
+        """
+        Initialise my bytearray from FIELD, a list of lists of Cells.
+        If FIELD is not provided, initialise an empty CompactField.
+        """
+        if field is None:
+            self.cells = bytearray(FIELD_SIZE)
+            self.zobrist_hash = 0
+        else:
+            self.cells = bytearray(cell.value for row in field for cell in row)
+            self.zobrist_hash = self._get_rows_zobrist_key(self.height)
+
+    def __buffer__(self, flags):
+        """Return a memoryview of my bytearray (PEP 688, Python 3.12 and later)."""
+        return memoryview(self.cells)
+
+    @property
+    def buffer(self):
+        """A memoryview of my bytearray. Unlike memoryview(self), it works on Python versions before 3.12."""
+        return memoryview(self.cells)
+
+    def __copy__(self):
+        return self.copy_field()
+
+    def __deepcopy__(self, memo):
+        return self.copy_field()
+
+    @property
+    def field(self):
+        """A list of lists of Cells equivalent to my bytearray. Modifying it does NOT modify me."""
+        return [self.get_row(row) for row in range(self.height)]
+
+    def __eq__(self, other):
+        """Return True if the OTHER field has the same Cells as mine."""
+        assert isinstance(other, Field)
+        if isinstance(other, CompactField):
+            return self.cells == other.cells
+        return super().__eq__(other)
+
+    __hash__ = Field.__hash__
+
+    ##############################
+    # Individual Cell operations #
+    ##############################
+
+    def get_cell(self, row, column):
+        return CELLS[self.cells[row * self.width + column]]
+
+    def set_cell(self, row, column, cell):
+        assert isinstance(cell, Cell)
+        index = row * self.width + column
+        keys = ZOBRIST_KEYS[index]
+        self.zobrist_hash ^= keys[self.cells[index]] ^ keys[cell.value]
+        self.cells[index] = cell.value
+
+    def is_cell_empty(self, row, column):
+        return not self.cells[row * self.width + column]
+
+    ##################
+    # Row operations #
+    ##################
+
+    def get_row(self, row):
+        """Return a new list of the Cells in ROW. Modifying it does NOT modify me."""
+        assert 0 <= row < self.height
+        start = row * self.width
+        return [CELLS[value] for value in self.cells[start:start + self.width]]
+
+    def get_row_bitmask(self, row):
+        start = row * self.width
+        return sum(1 << column for column in range(self.width) if self.cells[start + column])
+
+    def is_row_empty(self, row):
+        start = row * self.width
+        return not any(self.cells[start:start + self.width])
+
+    def is_row_filled(self, row):
+        start = row * self.width
+        return 0 not in self.cells[start:start + self.width]
+
+    def line_clear(self, rows=None):
+        if rows is None:
+            rows = range(self.height)
+        filled = sorted(row for row in set(rows) if self.is_row_filled(row))
+        if filled:
+            stop_row = filled[-1] + 1
+            old_key = self._get_rows_zobrist_key(stop_row)
+            kept_rows = [self.cells[row * self.width:(row + 1) * self.width] for row in range(self.height)
+                         if row not in filled]
+            self.cells = bytearray(len(filled) * self.width) + b"".join(kept_rows)
+            self.zobrist_hash ^= old_key ^ self._get_rows_zobrist_key(stop_row)
+        return len(filled)
+
+    ######################
+    # Occupancy counters #
+    ######################
+
+    def get_column_height(self, column):
+        return self._compute_column_height(column)
+
+    def get_column_heights(self):
+        return tuple(self._compute_column_height(column) for column in range(self.width))
+
+    def get_row_count(self, row):
+        start = row * self.width
+        return self.width - self.cells[start:start + self.width].count(0)
+
+    def get_num_nonempty_cells(self):
+        return len(self.cells) - self.cells.count(0)
+
+    def _compute_column_height(self, column):
+        for row in range(self.height - 1):
+            if self.cells[row * self.width + column]:
+                return self.height - 1 - row
+        return 0
+
+    #################################
+    # Convert to FieldWithTetromino #
+    #################################
+
+    def spawn_tetromino(self, cell, rotation_system=SuperRotationSystem):
+        tetromino = Tetromino.get(cell, rotation_system.get_spawn_rotation())
+        fwt = CompactFieldWithTetromino(tetromino, None, rotation_system)
+        fwt.cells = self.cells[:]
+        fwt.zobrist_hash = self.zobrist_hash
+        return fwt
+
+    ###########
+    # Utility #
+    ###########
+
+    def copy_field(self):
+        new_field = CompactField.__new__(CompactField)
+        new_field.cells = self.cells[:]
+        new_field.zobrist_hash = self.zobrist_hash
+        return new_field
+
+    def to_field(self):
+        """Return an equivalent Field of Cells."""
+        return Field(self.field)
+
+
+class CompactFieldWithTetromino(FieldWithTetromino, CompactField):
+    """
+    A CompactField with a Tetromino yet to be placed.
+    Copies made with deepcopy(self) slice my bytearray and share my immutable Tetromino and RotationSystem.
+    """
+
+    def __copy__(self):
+        new_field = object.__new__(type(self))
+        new_field.cells = self.cells[:]
+        new_field.zobrist_hash = self.zobrist_hash
+        new_field.__dict__.update(self.__dict__)
+        return new_field
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __eq__(self, other):
+        assert isinstance(other, FieldWithTetromino)
+        if not isinstance(other, CompactFieldWithTetromino):
+            return super().__eq__(other)
+        return self.cells == other.cells and self.tetromino == other.tetromino and \
+            (self.offset_row, self.offset_column) == (other.offset_row, other.offset_column) and \
+            self.rotation_system == other.rotation_system
+
+    __hash__ = FieldWithTetromino.__hash__
@@ -0,0 +1,83 @@
+from field import Field, FieldWithTetromino
+from rotation_system import SuperRotationSystem
+from tetromino import Tetromino
+
+
+class CopyOnWriteField(Field):
+    """
+    A Field that shares its row lists with the Fields copied from it and the Fields it was copied from.
+    A row is copied only when it is about to be modified and is not owned by me,
+    so a placement copies at most four rows and a line clear copies none.
+
+    My OWNED_ROWS is the set of row indices whose lists no other Field refers to.
+    """
+    __slots__ = ("owned_rows",)
+
+    def __init__(self, field=None):
+        """Same as Field. My rows start out owned by me."""
+        super().__init__(field)
+        self.owned_rows = set(range(self.height))
+
+    def __copy__(self):
+        return self.copy_field()
+
+    def __deepcopy__(self, memo):
+        return self.copy_field()
+
+    def set_cell(self, row, column, cell):
+        """Set the Cell specified by ROW and COLUMN to CELL. Copy the ROW first if it is shared."""
+        if row not in self.owned_rows:
+            self.field[row] = self.field[row][:]
+            self.owned_rows.add(row)
+        super().set_cell(row, column, cell)
+
+    def line_clear(self, rows=None):
+        """Same as Field.line_clear. Rows that are kept are moved down without being copied."""
+        owned_row_ids = {id(self.field[row]) for row in self.owned_rows}
+        lines_cleared = super().line_clear(rows)
+        if lines_cleared:
+            # The new empty rows at the top are mine
+            self.owned_rows = set(range(lines_cleared)) | \
+                {row for row in range(lines_cleared, self.height) if id(self.field[row]) in owned_row_ids}
+        return lines_cleared
+
+    def spawn_tetromino(self, cell, rotation_system=SuperRotationSystem):
+        tetromino = Tetromino.get(cell, rotation_system.get_spawn_rotation())
+        fwt = CopyOnWriteFieldWithTetromino.__new__(CopyOnWriteFieldWithTetromino)
+        fwt.tetromino = tetromino
+        fwt.rotation_system = rotation_system
+        fwt.offset_row, fwt.offset_column = rotation_system.get_spawn_offsets(tetromino)
+        return self._share_rows(fwt)
+
+    def copy_field(self):
+        return self._share_rows(CopyOnWriteField.__new__(CopyOnWriteField))
+
+    def to_field(self):
+        """Return an equivalent Field that shares no rows with me."""
+        return Field(self.field)
+
+    def _share_rows(self, new_field):
+        """Let NEW_FIELD refer to my rows and return it. Neither of us owns any row afterwards."""
+        new_field.field = self.field[:]
+        new_field.zobrist_hash = self.zobrist_hash
+        new_field.row_counts = self.row_counts[:]
+        new_field.column_heights = self.column_heights[:]
+        new_field.num_nonempty_cells = self.num_nonempty_cells
+        new_field.owned_rows = set()
+        self.owned_rows = set()
+        return new_field
+
+
+class CopyOnWriteFieldWithTetromino(FieldWithTetromino, CopyOnWriteField):
+    """
+    A CopyOnWriteField with a Tetromino yet to be placed.
+    Copies made with deepcopy(self) share my rows, my Tetromino and my RotationSystem.
+    """
+
+    def __copy__(self):
+        new_field = object.__new__(type(self))
+        new_field.__dict__.update(self.__dict__)
+        return self._share_rows(new_field)
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
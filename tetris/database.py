@@ -4,7 +4,9 @@ import os
 import shutil
 from tempfile import NamedTemporaryFile
 
+from cell import Cell
 from fumen import Fumen
+from pc_field import PCField
 
 
 ########
@@ -21,7 +23,16 @@ def get_move_path(field, piece):
 
 
 def pc_mode_fetch_possible_next_fields(field, piece):
-    """Return a set of possible Fields from FIELD using PIECE."""
+    """
+    Return a set of possible Fields from FIELD using PIECE.
+    A Field and its mirror image share one cache entry, see Field.get_canonical_form.
+    I is left out because its SRS kicks are not mirror-symmetric.
+    """
+    if piece is not Cell.I:
+        canonical_field, is_mirrored = field.get_canonical_form()
+        if is_mirrored:
+            return {f.mirror() for f in pc_mode_fetch_possible_next_fields(canonical_field, piece.mirror())}
+
     move_path = get_move_path(field, piece)
     if os.path.exists(move_path):
         with open(move_path, 'r') as move_file:
@@ -31,15 +42,43 @@ def pc_mode_fetch_possible_next_fields(field, piece):
                 fields.add(Fumen.decode(fumen_code.strip())[0])
             return fields
 
-    fwt = field.spawn_tetromino(piece)
-    fields = fwt.get_possible_fields_below_height(4, convert_to_grey=True)
+    if PCField.fits(field):
+        fields = {pc_field.to_field() for pc_field in PCField.from_field(field).get_possible_fields(piece)}
+    else:   # Too high for a perfect clear
+        fwt = field.spawn_tetromino(piece)
+        fields = fwt.get_possible_fields_below_height(4, convert_to_grey=True)
+    save_possible_next_fields(move_path, fields)
+    return fields
+
+
+def pc_mode_fetch_possible_next_fields_of_many(fields_and_pieces, pool):
+    """
+    Return a list of the sets of pc_mode_fetch_possible_next_fields of each (Field, piece) pair of FIELDS_AND_PIECES
+    in order. The pairs that are not cached yet are computed on POOL, a PlacementPool, with
+    FieldWithTetromino.get_possible_fields_below_height, which gives the same Fields as PCField, then cached.
+    """
+    fields_and_pieces = list(fields_and_pieces)
+    move_paths_to_jobs = dict()
+    for field, piece in fields_and_pieces:
+        if piece is not Cell.I:
+            canonical_field, is_mirrored = field.get_canonical_form()
+            if is_mirrored:
+                field, piece = canonical_field, piece.mirror()
+        move_path = get_move_path(field, piece)
+        if not os.path.exists(move_path):
+            move_paths_to_jobs[move_path] = (field, piece)
+    possible_fields = pool.get_possible_fields(move_paths_to_jobs.values(), convert_to_grey=True, height=4)
+    for move_path, fields in zip(move_paths_to_jobs, possible_fields):
+        save_possible_next_fields(move_path, fields)
+    return [pc_mode_fetch_possible_next_fields(field, piece) for field, piece in fields_and_pieces]
 
+
+def save_possible_next_fields(move_path, fields):
+    """Write FIELDS to the new file at MOVE_PATH, see get_move_path."""
     with open(move_path, 'x') as move_file:
         for field in fields:
             move_file.write(Fumen.encode([field]) + '\n')
 
-    return fields
-
 
 ##########
 # Values #
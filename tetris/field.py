@@ -1,10 +1,109 @@
 from copy import deepcopy
+from random import Random
 
 from cell import Cell
 from control import Control
-from rotation_system import SuperRotationSystem
+from placement import Placement
+from placement_search import ROTATION_CONTROLS, StateMoves, get_landed_state_controls, iter_hard_drop_states, \
+    iter_landed_states
+from rotation import ROTATIONS
+from rotation_system import ROTATION_DIRECTIONS, SuperRotationSystem
 from tetromino import Tetromino
-from utils import flatten, subtract_lists_of_offsets, bfs
+from utils import subtract_lists_of_offsets
+
+# Zobrist keys indexed by Cell index (row * 10 + column) then Cell value.
+# A Field hashes to the XOR of the keys of its Cells. EMPTY Cells have key 0 so the empty Field hashes to 0.
+_zobrist_random = Random(240)
+ZOBRIST_KEYS = tuple(tuple([0] + [_zobrist_random.getrandbits(63) for _ in range(len(Cell) - 1)])
+                     for _ in range(240))
+
+# Number of bytes of the occupancy bitmask of a Field, one bit per Cell
+OCCUPANCY_SIZE = 30
+
+MAX_LINES_CLEARED = 4   # A Tetromino spans at most 4 rows
+
+
+def are_offsets_valid(get_row_bitmask, tetromino, offset_row, offset_column):
+    """
+    Return True if OFFSETS keep TETROMINO within a Field and without overlapping with nonempty Cells,
+    where GET_ROW_BITMASK(row) returns the bitmask of nonempty Cells in a row of the Field as Field.get_row_bitmask.
+    The precomputed Tetromino.row_masks of TETROMINO are tested against the rows with one masked AND each.
+    """
+    min_row, max_row, min_column, max_column = tetromino.bounding_box
+    # The last row is below the field
+    if not (0 <= offset_row + min_row and offset_row + max_row < Field.height - 1 and
+            0 <= offset_column + min_column and offset_column + max_column < Field.width):
+        return False
+    if offset_column >= 0:
+        return not any(get_row_bitmask(offset_row + row) & row_mask << offset_column
+                       for row, row_mask in tetromino.row_masks)
+    return not any(get_row_bitmask(offset_row + row) & row_mask >> -offset_column
+                   for row, row_mask in tetromino.row_masks)
+
+
+def get_drop_distance(get_column_bitmask, tetromino, offset_row, offset_column):
+    """
+    Return the number of rows TETROMINO falls from valid OFFSETS when hard dropped,
+    where GET_COLUMN_BITMASK(column) returns the bitmask of nonempty Cells in a column of the Field
+    as Field.get_column_bitmask.
+    Each Cell of the precomputed Tetromino.skirt of TETROMINO falls to the first nonempty Cell below it,
+    found as the lowest set bit of the column bitmask shifted past it, instead of probing row by row.
+    """
+    floor = 1 << Field.height - 1   # The last row is below the field
+    distance = Field.height
+    for column, row in tetromino.skirt:
+        rows_below = (get_column_bitmask(offset_column + column) | floor) >> offset_row + row + 1
+        distance = min(distance, (rows_below & -rows_below).bit_length() - 1)
+    return distance
+
+
+def is_placement_below_height(get_row_bitmask, tetromino, offset_row, offset_column, height):
+    """
+    Return True if placing TETROMINO with valid OFFSETS on a Field then clearing lines leaves an empty row
+    among the bottom HEIGHT + 1 visible rows, as required of the Fields of get_possible_fields_below_height,
+    where GET_ROW_BITMASK(row) returns the bitmask of nonempty Cells in a row of the Field as Field.get_row_bitmask.
+    The rows are scanned from the bottom with the Tetromino ORed in and its filled rows skipped, so no Field is made.
+    """
+    full_row = (1 << Field.width) - 1
+    if offset_column >= 0:
+        tetromino_row_masks = {offset_row + row: row_mask << offset_column for row, row_mask in tetromino.row_masks}
+    else:
+        tetromino_row_masks = {offset_row + row: row_mask >> -offset_column for row, row_mask in tetromino.row_masks}
+    num_kept_rows = 0
+    for row in reversed(range(Field.height - 1)):   # The last row is below the field
+        row_mask = get_row_bitmask(row) | tetromino_row_masks.get(row, 0)
+        if row_mask == full_row and row in tetromino_row_masks:
+            continue    # Cleared
+        if not row_mask:
+            return True
+        num_kept_rows += 1
+        if num_kept_rows > height:
+            return False
+    return True     # Empty rows are added from the top
+
+
+def does_placement_clear_lines(get_row_bitmask, tetromino, offset_row, offset_column):
+    """
+    Return True if placing TETROMINO with valid OFFSETS on a Field fills a row,
+    where GET_ROW_BITMASK(row) returns the bitmask of nonempty Cells in a row of the Field as Field.get_row_bitmask.
+    """
+    full_row = (1 << Field.width) - 1
+    if offset_column >= 0:
+        return any(get_row_bitmask(offset_row + row) | row_mask << offset_column == full_row
+                   for row, row_mask in tetromino.row_masks)
+    return any(get_row_bitmask(offset_row + row) | row_mask >> -offset_column == full_row
+               for row, row_mask in tetromino.row_masks)
+
+
+def get_column_bitmasks(row_bitmasks):
+    """Return a list of the column bitmasks, as Field.get_column_bitmask, of a Field with ROW_BITMASKS."""
+    column_bitmasks = [0] * Field.width
+    for row, row_bitmask in enumerate(row_bitmasks):
+        while row_bitmask:
+            lowest_bit = row_bitmask & -row_bitmask
+            column_bitmasks[lowest_bit.bit_length() - 1] |= 1 << row
+            row_bitmask ^= lowest_bit
+    return column_bitmasks
 
 
 class Field:
@@ -30,6 +129,8 @@ class Field:
     │230┆231┆232┆233┆234│235┆236┆237┆238┆239│ Row 23    Hidden row
     └───┴───┴───┴───┴───┴───┴───┴───┴───┴───┘
     """
+    __slots__ = ("field", "zobrist_hash", "row_counts", "column_heights", "num_nonempty_cells")
+
     width = 10
     height = 24
 
@@ -40,27 +141,86 @@ class Field:
         """
         if field is None:
             # Use 24 rows of 10 long lists
-            self.field = [[Cell.EMPTY for _ in range(self.width)] for _ in range(self.height)]
+            self.field = [[Cell.EMPTY] * self.width for _ in range(self.height)]
+            self.zobrist_hash = 0
+            self.row_counts = [0] * self.height
+            self.column_heights = [0] * self.width
+            self.num_nonempty_cells = 0
         else:
             # Copy the provided FIELD
-            self.field = deepcopy(field)
+            self.field = [list(row) for row in field]
+            self.row_counts = [self.width - row.count(Cell.EMPTY) for row in self.field]
+            self.zobrist_hash = self._get_rows_zobrist_key(self.height)
+            self.column_heights = self._compute_column_heights()
+            self.num_nonempty_cells = sum(self.row_counts)
 
     def __repr__(self):
         from fumen import Fumen     # bypass circular dependency
         return Fumen.encode([self])
 
     def __eq__(self, other):
-        """Return True if the OTHER field has the same field as mine."""
+        """Return True if the OTHER field has the same field as mine, whichever kind of Field it is."""
         assert isinstance(other, Field)
-        return self.field == other.field
+        if self.zobrist_hash != other.zobrist_hash:
+            return False
+        if isinstance(other.field, list):
+            return self.field == other.field
+        # Rows of other kinds of Fields, e.g. the tuples of a FrozenField, are compared as lists
+        return all(list(self.get_row(row)) == list(other.get_row(row)) for row in range(self.height))
 
     def __hash__(self):
-        """Returns a unique hash for different fields"""
-        hash = 0
-        for cell in flatten(self.field):
-            hash *= 9   # 9 types of Cells
-            hash += cell.value
-        return hash
+        """Return my Zobrist hash. It is kept up to date whenever my Cells change."""
+        return self.zobrist_hash
+
+    def __deepcopy__(self, memo):
+        return self.copy_field()
+
+    def __reduce__(self):
+        """Pickle me as the bytes given by to_bytes."""
+        return self.from_bytes, (self.to_bytes(),)
+
+    #################
+    # Serialisation #
+    #################
+
+    def to_bytes(self):
+        """
+        Return my Cells encoded as bytes. The first 30 bytes are a little-endian bitmask whose bit 10 * row + column
+        is set if and only if the Cell at row and column is nonempty. Unless all nonempty Cells are GREY, they are
+        followed by the values of the nonempty Cells in that order, packed two to a byte with the first in the low half.
+        """
+        occupancy = 0
+        values = []
+        for row in range(self.height):
+            if self.is_row_empty(row):
+                continue
+            occupancy |= self.get_row_bitmask(row) << row * self.width
+            values.extend(cell.value for cell in self.get_row(row) if not cell.is_empty())
+        data = occupancy.to_bytes(OCCUPANCY_SIZE, "little")
+        if any(value != Cell.GREY.value for value in values):
+            values.append(Cell.EMPTY.value)     # Pad to an even length
+            data += bytes(values[i] | values[i + 1] << 4 for i in range(0, len(values) - 1, 2))
+        return data
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Return a new Field of my type with the Cells encoded in DATA by to_bytes."""
+        return cls(cls._get_rows_from_bytes(data))
+
+    @classmethod
+    def _get_rows_from_bytes(cls, data):
+        """Return a list of lists of Cells encoded in DATA by to_bytes."""
+        occupancy = int.from_bytes(data[:OCCUPANCY_SIZE], "little")
+        values = data[OCCUPANCY_SIZE:]
+        rows = [[Cell.EMPTY] * cls.width for _ in range(cls.height)]
+        i = 0
+        while occupancy:
+            lowest_bit = occupancy & -occupancy
+            occupancy ^= lowest_bit
+            row, column = divmod(lowest_bit.bit_length() - 1, cls.width)
+            rows[row][column] = Cell(values[i >> 1] >> 4 * (i & 1) & 15) if values else Cell.GREY
+            i += 1
+        return rows
 
     ##############################
     # Individual Cell operations #
@@ -73,7 +233,20 @@ class Field:
     def set_cell(self, row, column, cell):
         """Set the Cell specified by ROW and COLUMN to CELL."""
         assert isinstance(cell, Cell)
+        old_cell = self.field[row][column]
+        keys = ZOBRIST_KEYS[row * self.width + column]
+        self.zobrist_hash ^= keys[old_cell.value] ^ keys[cell.value]
         self.field[row][column] = cell
+        change = old_cell.is_empty() - cell.is_empty()
+        if change:
+            self.row_counts[row] += change
+            self.num_nonempty_cells += change
+            if row < self.height - 1:
+                row_height = self.height - 1 - row
+                if change > 0:
+                    self.column_heights[column] = max(self.column_heights[column], row_height)
+                elif self.column_heights[column] == row_height:
+                    self.column_heights[column] = self._compute_column_height(column)
 
     def is_cell_empty(self, row, column):
         """Return True if the Cell at ROW and COLUMN of my Field is empty or False otherwise."""
@@ -92,30 +265,79 @@ class Field:
         assert 0 <= row < self.height
         return self.field[row]
 
+    def get_row_bitmask(self, row):
+        """Return an int whose bit i is set if and only if the Cell in column i of ROW is nonempty."""
+        return sum(1 << column for column, cell in enumerate(self.get_row(row)) if not cell.is_empty())
+
     def is_row_empty(self, row):
         """Return True if the ROW of the field is all empty or False otherwise."""
-        return all(cell.is_empty() for cell in self.get_row(row))
+        return not self.row_counts[row]
 
     def is_row_filled(self, row):
         """Return True if the ROW of the field is all filled i.e. no Cell in the ROW is EMPTY."""
-        return not any(cell.is_empty() for cell in self.get_row(row))
+        return self.row_counts[row] == self.width
 
-    def line_clear(self):
+    def line_clear(self, rows=None):
         """
         Remove completely filled rows from my field and add empty rows from the top of my field.
+        If ROWS is provided, only those rows are checked, e.g. the rows occupied by the last placed Tetromino.
         Return the number of rows removed.
         """
-        new_field = []
-        lines_cleared = 0
-        for row in range(self.height):
-            if not self.is_row_filled(row):
-                new_field.append(self.get_row(row))
+        if rows is None:
+            rows = range(self.height)
+        filled_rows = sorted(row for row in set(rows) if self.is_row_filled(row))
+        if not filled_rows:
+            return 0
+
+        # Only rows above the bottommost cleared row move. Shift them down in one pass.
+        lines_cleared = len(filled_rows)
+        stop_row = filled_rows[-1] + 1
+        old_key = self._get_rows_zobrist_key(stop_row)
+        kept_rows = [row for row in range(stop_row) if row not in filled_rows]
+        self.field[lines_cleared:stop_row] = [self.field[row] for row in kept_rows]
+        self.field[:lines_cleared] = [[Cell.EMPTY] * self.width for _ in range(lines_cleared)]
+        self.row_counts[lines_cleared:stop_row] = [self.row_counts[row] for row in kept_rows]
+        self.row_counts[:lines_cleared] = [0] * lines_cleared
+        self.zobrist_hash ^= old_key ^ self._get_rows_zobrist_key(stop_row)
+        self.num_nonempty_cells -= lines_cleared * self.width
+
+        # Every column reaches the cleared rows, so its topmost Cell moves down by LINES_CLEARED
+        # unless that Cell was cleared, in which case the column is looked up again
+        for column in range(self.width):
+            if self.height - 1 - self.column_heights[column] in filled_rows:
+                self.column_heights[column] = self._compute_column_height(column)
             else:
-                lines_cleared += 1
-                new_field.insert(0, [Cell.EMPTY for _ in range(self.width)])
-        self.field = new_field
+                self.column_heights[column] -= lines_cleared
         return lines_cleared
 
+    ######################
+    # Occupancy counters #
+    ######################
+
+    def get_column_height(self, column):
+        """
+        Return the number of rows from the bottom of the visible field up to and including
+        the topmost nonempty Cell in COLUMN, or 0 if COLUMN is empty. The row below the visible field is not counted.
+        """
+        return self.column_heights[column]
+
+    def get_column_heights(self):
+        """Return a tuple of the heights of all my columns from left to right."""
+        return tuple(self.column_heights)
+
+    def get_column_bitmask(self, column):
+        """Return an int whose bit i is set if and only if the Cell in row i of COLUMN is nonempty."""
+        top_row = self.height - 1 - self.get_column_height(column)     # Nothing above is nonempty
+        return sum(1 << row for row in range(top_row, self.height) if not self.is_cell_empty(row, column))
+
+    def get_row_count(self, row):
+        """Return the number of nonempty Cells in ROW."""
+        return self.row_counts[row]
+
+    def get_num_nonempty_cells(self):
+        """Return the number of nonempty Cells in my field."""
+        return self.num_nonempty_cells
+
     #################################
     # Convert to FieldWithTetromino #
     #################################
@@ -125,13 +347,40 @@ class Field:
         tetromino = Tetromino.get(cell, rotation_system.get_spawn_rotation())
         return FieldWithTetromino(tetromino, self.field, rotation_system)
 
+    def get_possible_fields_of_pieces(self, pieces, convert_to_grey=False, hard_drop_only=False,
+                                      rotation_system=SuperRotationSystem):
+        """
+        Return a dict of each Cell of PIECES to the set of Fields of get_possible_fields of its Tetromino spawned on me,
+        e.g. to expand a Field for all seven pieces at once.
+        The work that only depends on my Cells is done once for all PIECES: one FieldWithTetromino is spawned
+        and respawned with each piece, its row and column bitmasks are read once and its Cells are converted once.
+        """
+        pieces = list(pieces)
+        if not pieces:
+            return dict()
+        fwt = self.spawn_tetromino(pieces[0], rotation_system)
+        row_bitmasks = [fwt.get_row_bitmask(row) for row in range(self.height)]
+        column_bitmasks = get_column_bitmasks(row_bitmasks)
+        grey_field = fwt.convert_cells_to_grey() if convert_to_grey else None
+        pieces_to_fields = dict()
+        for piece in pieces:
+            fwt.tetromino = Tetromino.get(piece, rotation_system.get_spawn_rotation())
+            fwt.offset_row, fwt.offset_column = rotation_system.get_spawn_offsets(fwt.tetromino)
+            moves = fwt._get_state_moves(row_bitmasks, column_bitmasks)
+            placements = {Placement(piece, ROTATIONS[rotation], offset_row, offset_column)
+                          for rotation, offset_row, offset_column
+                          in fwt._iter_possible_placement_states(hard_drop_only, moves=moves)}
+            pieces_to_fields[piece] = set(fwt._iter_placement_fields(placements, convert_to_grey, grey_field))
+        return pieces_to_fields
+
     ###########
     # Utility #
     ###########
 
     def is_visibly_empty(self):
         """Return True if the visible field is completely empty or False otherwise."""
-        return all(self.is_row_empty(row) for row in range(3, self.height - 1))
+        hidden_cells = sum(self.get_row_count(row) for row in (0, 1, 2, self.height - 1))
+        return self.get_num_nonempty_cells() == hidden_cells
 
     def index_to_coords(self, index):
         """Return the row and column corresponding to INDEX from 0 to 239 inclusive."""
@@ -139,9 +388,43 @@ class Field:
         column = index % self.width
         return row, column
 
+    def mirror(self):
+        """Return a new Field of my type that is my left-right mirror image, with every Cell mirrored."""
+        return type(self)([[cell.mirror() for cell in reversed(self.get_row(row))] for row in range(self.height)])
+
+    def get_canonical_form(self):
+        """
+        Return a tuple of my canonical form and True if it is my mirror image or False if it is me.
+        A Field and its mirror image have the same canonical form, so caches keyed on it serve both.
+        Moving a Tetromino on my mirror image mirrors the Tetromino too, see Cell.mirror.
+        """
+        def get_key(field):
+            return field.zobrist_hash, [cell.value for row in range(field.height) for cell in field.get_row(row)]
+
+        mirrored_field = self.mirror()
+        if mirrored_field.zobrist_hash != self.zobrist_hash:
+            is_mirrored = mirrored_field.zobrist_hash < self.zobrist_hash
+        else:
+            is_mirrored = get_key(mirrored_field) < get_key(self)
+        return (mirrored_field, True) if is_mirrored else (self, False)
+
+    def copy_field(self):
+        """Return a new Field with a copy of my Cells. Any Tetromino yet to be placed is left out."""
+        new_field = Field.__new__(Field)
+        self._copy_cells_to(new_field)
+        return new_field
+
+    def _copy_cells_to(self, new_field):
+        """Give NEW_FIELD a copy of my Cells and everything kept up to date with them."""
+        new_field.field = [list(row) for row in self.field]
+        new_field.zobrist_hash = self.zobrist_hash
+        new_field.row_counts = list(self.row_counts)
+        new_field.column_heights = list(self.column_heights)
+        new_field.num_nonempty_cells = self.num_nonempty_cells
+
     def convert_cells_to_grey(self):
         """Return a new Field where all nonempty cells are converted to GREY."""
-        new_field = Field(self.field)
+        new_field = self.copy_field()
         for row in range(new_field.height):
             for column in range(new_field.width):
                 if not new_field.is_cell_empty(row, column):
@@ -154,6 +437,35 @@ class Field:
                 return row
         return -1
 
+    def _compute_column_height(self, column):
+        """Return the height of COLUMN by scanning it from the top. See get_column_height."""
+        for row in range(self.height - 1):
+            if not self.is_row_empty(row) and not self.is_cell_empty(row, column):
+                return self.height - 1 - row
+        return 0
+
+    def _compute_column_heights(self):
+        """Return a list of the heights of all my columns by scanning my rows once from the top."""
+        column_heights = [0] * self.width
+        for row in range(self.height - 1):
+            if self.is_row_empty(row):
+                continue
+            for column, cell in enumerate(self.get_row(row)):
+                if not column_heights[column] and not cell.is_empty():
+                    column_heights[column] = self.height - 1 - row
+        return column_heights
+
+    def _get_rows_zobrist_key(self, stop_row):
+        """Return the XOR of the Zobrist keys of the Cells in rows 0 to STOP_ROW exclusive."""
+        key = 0
+        for row in range(stop_row):
+            if self.is_row_empty(row):
+                continue
+            keys = ZOBRIST_KEYS[row * self.width:(row + 1) * self.width]
+            for column, cell in enumerate(self.get_row(row)):
+                key ^= keys[column][cell.value]
+        return key
+
 
 class FieldWithTetromino(Field):
     """A Field with a Tetromino yet to be placed. Allows the Tetromino to be moved before being placed."""
@@ -171,20 +483,36 @@ class FieldWithTetromino(Field):
 
     def __eq__(self, other):
         assert isinstance(other, FieldWithTetromino)
-        return self.field == other.field and self.tetromino == other.tetromino and \
+        return self.tetromino == other.tetromino and \
             (self.offset_row, self.offset_column) == (other.offset_row, other.offset_column) and \
-            self.rotation_system == other.rotation_system
+            self.rotation_system == other.rotation_system and Field.__eq__(self, other)
 
     def __hash__(self):
-        hash = 0
-        for cell in flatten(self.field):
-            hash *= 9   # 9 types of Cells
-            hash += cell.value
-        hash *= self.height
-        hash += self.offset_row
-        hash *= self.width
-        hash += self.offset_column
-        return hash
+        return hash((self.zobrist_hash, self.tetromino.rotation.value, self.offset_row, self.offset_column))
+
+    def __deepcopy__(self, memo):
+        """Return a copy of me that shares my immutable Tetromino and RotationSystem."""
+        new_field = object.__new__(type(self))
+        new_field.__dict__.update(self.__dict__)
+        self._copy_cells_to(new_field)
+        return new_field
+
+    def __reduce__(self):
+        """Pickle me as the bytes of my Cells, my Tetromino and my offsets. SRS is left out as the default."""
+        args = (self.to_bytes(), self.tetromino.cell.value, self.tetromino.rotation.value,
+                self.offset_row, self.offset_column)
+        if self.rotation_system is not SuperRotationSystem:
+            args += (self.rotation_system,)
+        return self.from_bytes, args
+
+    @classmethod
+    def from_bytes(cls, data, cell_value, rotation_value, offset_row, offset_column,
+                   rotation_system=SuperRotationSystem):
+        """Return a new FieldWithTetromino of my type from the arguments given by __reduce__."""
+        tetromino = Tetromino.get(Cell(cell_value), ROTATIONS[rotation_value])
+        fwt = cls(tetromino, cls._get_rows_from_bytes(data), rotation_system)
+        fwt.offset_row, fwt.offset_column = offset_row, offset_column
+        return fwt
 
     #####################
     # Tetromino control #
@@ -198,9 +526,10 @@ class FieldWithTetromino(Field):
             if the Control is HARD_DROP and IGNORE_LINES_CLEARED is False.
         """
         assert control in self._controls_to_execute_fns
-        field = self._controls_to_execute_fns[control](self)
-        lines_cleared = field.line_clear()
-        if Control is Control.HARD_DROP and not ignore_lines_cleared:
+        if control is not Control.HARD_DROP:
+            return self._controls_to_execute_fns[control](self)
+        field, lines_cleared = self._place_tetromino_and_line_clear(state=self._get_hard_drop_state())
+        if not ignore_lines_cleared:
             return field, lines_cleared
         return field
 
@@ -245,90 +574,251 @@ class FieldWithTetromino(Field):
     def are_current_offsets_valid(self):
         return self._are_offsets_valid(self.offset_row, self.offset_column)
 
-    def get_possible_fields(self, convert_to_grey=False):
+    def get_possible_fields(self, convert_to_grey=False, hard_drop_only=False):
         """
         Return the set of all possible FieldWithTetrominos where the Tetromino can be placed on the spot
         (Tetromino is not floating and is not overlapping with existing non-empty Cells)
         that are attainable by controlling my Tetromino from my current position.
+        If CONVERT_TO_GREY is True, every nonempty Cell of the Fields is GREY. My Cells are converted once and
+        my Tetromino is placed as GREY Cells directly, so no coloured Field is made for any placement.
+        If HARD_DROP_ONLY is True, only placements reached by rotating, moving sideways and hard dropping are
+        searched, so a subset of the Fields without tucks and spins is returned much faster.
+        """
+        return self.get_placement_fields(self.get_possible_placements(hard_drop_only), convert_to_grey)
+
+    def iter_possible_fields(self, convert_to_grey=False, hard_drop_only=False):
+        """
+        Yield the Fields of get_possible_fields, each once, as the search finds them,
+        so that a caller that needs only some of them stops the search early.
         """
-        soft_drops = max(0, self.get_bottommost_visible_empty_row() - self.offset_row - 2)
-        start_field = self.execute_controls([Control.SOFT_DROP for _ in range(soft_drops)])
-        list_of_actions = [
-            lambda fwt: fwt._execute_move_left(),
-            lambda fwt: fwt._execute_move_right(),
-            lambda fwt: fwt._execute_soft_drop(),
-            lambda fwt: fwt._execute_hard_drop(),
-            lambda fwt: fwt._execute_rotate_cw(),
-            lambda fwt: fwt._execute_rotate_ccw()
-            # lambda fwt: fwt._execute_rotate_180()   # Not in SRS
-        ]
-        fwts = bfs(start_field, list_of_actions)
-        valid_placement_fwts = filter(lambda fwt: fwt.is_valid_placement(), fwts)
         fields = set()
-        for fwt in valid_placement_fwts:
-            field = fwt._place_tetromino()
-            field.line_clear()
-            fields.add(field)
+        for field in self._iter_placement_fields(self.iter_possible_placements(hard_drop_only), convert_to_grey):
+            if field not in fields:
+                fields.add(field)
+                yield field
+
+    def get_possible_placements(self, hard_drop_only=False, height=None):
+        """
+        Return the set of Placements of my Tetromino that give the Fields of get_possible_fields,
+        one per distinct set of occupied Cells, with HARD_DROP_ONLY as in get_possible_fields.
+        If HEIGHT is provided, only the Placements that give the Fields of get_possible_fields_below_height(HEIGHT)
+        are returned. No Field is made, see get_placement_field.
+        """
+        cell = self.tetromino.cell
+        return {Placement(cell, ROTATIONS[rotation], offset_row, offset_column) for rotation, offset_row, offset_column
+                in self._iter_possible_placement_states(hard_drop_only, height)}
+
+    def iter_possible_placements(self, hard_drop_only=False, height=None):
+        """Yield the Placements of get_possible_placements, each once, as the search finds them."""
+        cell = self.tetromino.cell
+        placements = set()
+        for rotation, offset_row, offset_column in self._iter_possible_placement_states(hard_drop_only, height):
+            placement = Placement(cell, ROTATIONS[rotation], offset_row, offset_column)
+            if placement not in placements:
+                placements.add(placement)
+                yield placement
+
+    def get_num_possible_placements(self, hard_drop_only=False, height=None):
+        """
+        Return the number of Placements of get_possible_placements without making their Fields.
+        This is at least the number of possible Fields as two Placements may clear lines down to the same Field,
+        see get_num_possible_fields.
+        """
+        return len(self.get_possible_placements(hard_drop_only, height))
+
+    def get_num_possible_fields(self, convert_to_grey=False, hard_drop_only=False):
+        """
+        Return the number of Fields of get_possible_fields.
+        Placements that clear no lines add four Cells on different Cells, so their Fields are distinct from each other
+        and from the Fields with cleared lines, and only the Fields of the Placements that clear lines are made.
+        """
+        placements = self.get_possible_placements(hard_drop_only)
+        line_clear_placements = [placement for placement in placements if does_placement_clear_lines(
+            self.get_row_bitmask, placement.get_tetromino(), placement.offset_row, placement.offset_column)]
+        return len(placements) - len(line_clear_placements) + \
+            len(self.get_placement_fields(line_clear_placements, convert_to_grey))
+
+    def get_placement_field(self, placement, convert_to_grey=False):
+        """
+        Return the Field obtained by placing PLACEMENT, a Placement of my Tetromino, on my Cells then clearing lines.
+        If CONVERT_TO_GREY is True, every nonempty Cell of the Field is GREY.
+        """
         if convert_to_grey:
-            return set(field.convert_cells_to_grey() for field in fields)
-        return fields
+            field, _ = self._place_tetromino_and_line_clear(self.convert_cells_to_grey(), Cell.GREY,
+                                                            self._get_placement_state(placement))
+        else:
+            field, _ = self._place_tetromino_and_line_clear(state=self._get_placement_state(placement))
+        return field
+
+    def get_placement_fields(self, placements, convert_to_grey=False):
+        """
+        Return the set of Fields of PLACEMENTS, Placements of my Tetromino, as get_placement_field.
+        If CONVERT_TO_GREY is True, my Cells are converted to GREY once for all PLACEMENTS.
+        """
+        return set(self._iter_placement_fields(placements, convert_to_grey))
+
+    def get_possible_fields_with_controls(self, convert_to_grey=False):
+        """
+        Return a dict of the Fields of get_possible_fields to a shortest list of Controls that gives each Field
+        from my current position, ending with HARD_DROP, so that a chosen Field can be played with execute_controls.
+        Ties are broken by fewest rotations.
+        """
+        if convert_to_grey:
+            field, cell = self.convert_cells_to_grey(), Cell.GREY
+        else:
+            field, cell = None, None
+
+        def get_cost(controls):
+            return len(controls), sum(control in ROTATION_CONTROLS for control in controls)
+
+        start_state = (self.tetromino.rotation.value, self.offset_row, self.offset_column)
+        fields_to_controls = dict()
+        for landed_state, controls in get_landed_state_controls(self._get_state_moves(), start_state).items():
+            rotation, offset_row, offset_column = landed_state
+            state = (Tetromino.get(self.tetromino.cell, ROTATIONS[rotation]), offset_row, offset_column)
+            new_field, _ = self._place_tetromino_and_line_clear(field, cell, state)
+            if new_field not in fields_to_controls or get_cost(controls) < get_cost(fields_to_controls[new_field]):
+                fields_to_controls[new_field] = controls
+        return fields_to_controls
 
     def get_possible_fields_below_height(self, height, convert_to_grey=False):
-        """Same as get_possible_fields but limit fields to HEIGHT. For example, PCMode is limited to height 4."""
-        possible_fields = self.get_possible_fields(convert_to_grey)
-        return {f for f in possible_fields if f.get_bottommost_visible_empty_row() + height + 2 >= f.height}
+        """
+        Same as get_possible_fields but limit fields to HEIGHT. For example, PCMode is limited to height 4.
+        Placements that are too high are dropped by their row bitmasks before their Fields are made,
+        and no search is done if no line clear can bring my Cells down to HEIGHT.
+        """
+        return self.get_placement_fields(self.get_possible_placements(height=height), convert_to_grey)
 
     ###########
     # Private #
     ###########
 
-    # Tetromino offset utilities
-    def _get_tetromino_nonempty_coords_with_offsets(self, offset_row, offset_column):
-        """Return a set of (row, column) coordinates of the cells of my Tetromino using OFFSETS."""
-        tetromino_coords = self.tetromino.get_nonempty_coords()
-        offset_coords = set()
-        for row, column in tetromino_coords:
-            offset_coords.add((row + offset_row, column + offset_column))
-        return offset_coords
+    # Placement search
+    def _get_state_moves(self, row_bitmasks=None, column_bitmasks=None):
+        """
+        Return the StateMoves of my Tetromino over my Cells, which are read once as row and column bitmasks
+        unless my ROW_BITMASKS and COLUMN_BITMASKS are provided.
+        """
+        tetrominos = tuple(Tetromino.get(self.tetromino.cell, rotation) for rotation in ROTATIONS)
+        if row_bitmasks is None:
+            row_bitmasks = [self.get_row_bitmask(row) for row in range(self.height)]
+        if column_bitmasks is None:
+            column_bitmasks = get_column_bitmasks(row_bitmasks)
 
-    def _are_offsets_valid(self, offset_row, offset_column):
-        """Return True if OFFSETS keep my Tetromino within my Field and without overlapping with nonempty Cells."""
+        def is_valid(state):
+            rotation, offset_row, offset_column = state
+            return are_offsets_valid(row_bitmasks.__getitem__, tetrominos[rotation], offset_row, offset_column)
 
-        def is_tetromino_contained_in_field_with_offsets(offset_row, offset_column):
-            """Return True if OFFSETS keep my Tetromino within my Field."""
-            tetromino_coords = self._get_tetromino_nonempty_coords_with_offsets(offset_row, offset_column)
-            for row, column in tetromino_coords:
-                if not (0 <= row < self.height - 1 and 0 <= column < self.width):  # The last row is below the field
-                    return False
-            return True
+        def get_state_drop_distance(state):
+            rotation, offset_row, offset_column = state
+            return get_drop_distance(column_bitmasks.__getitem__, tetrominos[rotation], offset_row, offset_column)
 
-        def is_tetromino_obstructed_with_offsets(offset_row, offset_column):
-            """
-            Return True if OFFSETS causes my Tetromino to overlap with non-empty Cells of my Field and False otherwise.
-            """
-            coords = self._get_tetromino_nonempty_coords_with_offsets(offset_row, offset_column)
-            for row, column in coords:
-                if not self.is_cell_empty(row, column):
-                    return True
-            return False
+        return StateMoves(self.tetromino.cell, is_valid, get_state_drop_distance, self.rotation_system)
+
+    def _get_possible_placement_states(self, hard_drop_only=False, height=None):
+        """
+        Return the set of (Rotation value, offset_row, offset_column) states of my Tetromino where it can be placed
+        on the spot that are attainable by controlling it from my current position, as used by get_possible_fields.
+        If HEIGHT is provided, only the states whose Fields are kept by get_possible_fields_below_height are returned.
+        """
+        return set(self._iter_possible_placement_states(hard_drop_only, height))
+
+    def _iter_possible_placement_states(self, hard_drop_only=False, height=None, moves=None):
+        """
+        Yield the states of _get_possible_placement_states, each once, as the search finds them.
+        MOVES is my StateMoves if already made.
+        """
+        if height is not None:
+            # Line clears only bring rows down from MAX_LINES_CLEARED rows above the bottom HEIGHT + 1 visible rows
+            top_row = self.height - 2 - height - MAX_LINES_CLEARED
+            if top_row >= 0 and all(not self.is_row_empty(row) for row in range(top_row, self.height - 1)):
+                return
+        if moves is None:
+            moves = self._get_state_moves()
+        start_state = (self.tetromino.rotation.value, self.offset_row, self.offset_column)
+        if hard_drop_only:
+            states = iter_hard_drop_states(moves, start_state)
+        else:
+            soft_drops = moves.get_soft_drops(start_state, self.get_bottommost_visible_empty_row())
+            states = iter_landed_states(moves, start_state, soft_drops)
+        for state in states:
+            rotation, offset_row, offset_column = state
+            if height is None or is_placement_below_height(self.get_row_bitmask,
+                                                           Tetromino.get(self.tetromino.cell, ROTATIONS[rotation]),
+                                                           offset_row, offset_column, height):
+                yield state
+
+    def _iter_placement_fields(self, placements, convert_to_grey=False, grey_field=None):
+        """
+        Yield the Field of each of PLACEMENTS, see get_placement_field.
+        If CONVERT_TO_GREY is True, my Cells are converted once, or GREY_FIELD is used if already converted,
+        and the Tetromino is placed as GREY Cells directly.
+        """
+        if convert_to_grey:
+            field, cell = self.convert_cells_to_grey() if grey_field is None else grey_field, Cell.GREY
+        else:
+            field, cell = None, None
+        for placement in placements:
+            new_field, _ = self._place_tetromino_and_line_clear(field, cell, self._get_placement_state(placement))
+            yield new_field
 
-        return is_tetromino_contained_in_field_with_offsets(offset_row, offset_column) and \
-               not is_tetromino_obstructed_with_offsets(offset_row, offset_column)
+    # Tetromino offset utilities
+    def _get_tetromino_nonempty_coords_with_offsets(self, offset_row, offset_column, tetromino=None):
+        """Return a set of (row, column) coordinates of the cells of TETROMINO, or my Tetromino, using OFFSETS."""
+        if tetromino is None:
+            tetromino = self.tetromino
+        return {(row + offset_row, column + offset_column) for row, column in tetromino.nonempty_coords}
+
+    def _are_offsets_valid(self, offset_row, offset_column, tetromino=None):
+        """
+        Return True if OFFSETS keep TETROMINO, or my Tetromino, within my Field and without overlapping with
+        nonempty Cells.
+        """
+        if tetromino is None:
+            tetromino = self.tetromino
+        return are_offsets_valid(self.get_row_bitmask, tetromino, offset_row, offset_column)
 
     # Convert to Field
-    def _place_tetromino(self):
+    def _place_tetromino(self, field=None, cell=None, state=None):
         """
         Place my Tetromino in the position specified by my Offsets.
         Assumes the current position is valid. My Tetromino is possibly floating.
         Returns the new Field object with my Tetromino placed in the current location.
         Does NOT clear lines.
+
+        The Tetromino is placed on a copy of FIELD if provided instead of my own Cells, which must have the same
+        nonempty Cells, and is made of CELL if provided instead of the Cell of my Tetromino.
+        STATE is a tuple (Tetromino, offset_row, offset_column) to place instead of my Tetromino and offsets.
         """
-        tetromino_coords = self.get_tetromino_nonempty_coords()
-        new_field = Field(self.field)
+        tetromino_coords = self._get_state_nonempty_coords(state)
+        new_field = (self if field is None else field).copy_field()
+        if cell is None:
+            cell = self.tetromino.cell
         for row, column in tetromino_coords:
-            new_field.set_cell(row, column, self.tetromino.cell)
+            new_field.set_cell(row, column, cell)
         return new_field
 
+    def _place_tetromino_and_line_clear(self, field=None, cell=None, state=None):
+        """
+        Place my Tetromino as in _place_tetromino then clear lines, checking only the rows my Tetromino occupies.
+        Returns a tuple of the new Field and the number of lines cleared.
+        """
+        new_field = self._place_tetromino(field, cell, state)
+        lines_cleared = new_field.line_clear({row for row, _ in self._get_state_nonempty_coords(state)})
+        return new_field, lines_cleared
+
+    @staticmethod
+    def _get_placement_state(placement):
+        """Return the (Tetromino, offset_row, offset_column) state of PLACEMENT as used by _place_tetromino."""
+        return placement.get_tetromino(), placement.offset_row, placement.offset_column
+
+    def _get_state_nonempty_coords(self, state=None):
+        """Return a set of (row, column) coordinates of the cells of the Tetromino in STATE or of my Tetromino."""
+        if state is None:
+            return self.get_tetromino_nonempty_coords()
+        tetromino, offset_row, offset_column = state
+        return self._get_tetromino_nonempty_coords_with_offsets(offset_row, offset_column, tetromino)
+
     # Control handling
     def _adopt_offsets_if_valid(self, offset_row, offset_column):
         """
@@ -349,12 +839,18 @@ class FieldWithTetromino(Field):
     def _execute_rotation(self, control):
         """Return a new FieldWithTetromino with my Tetromino rotated and kicked appropriately."""
         assert control in {Control.ROTATE_CW, Control.ROTATE_CCW, Control.ROTATE_180}
-        kicks = self.rotation_system.get_kick_tests(self.tetromino, control)
-        for column_kick, row_kick in kicks:
-            new_field = FieldWithTetromino(self.tetromino.rotate(control), self.field, self.rotation_system)
-            if new_field._adopt_offsets_if_valid(self.offset_row + row_kick, self.offset_column + column_kick):
-                return new_field
-        return deepcopy(self)   # All kick tests failed
+        kick_table = self.rotation_system.get_kick_table()
+        new_rotation, kicks = kick_table[self.tetromino.cell.value][self.tetromino.rotation.value][
+            ROTATION_DIRECTIONS.index(control)]
+        new_tetromino = Tetromino.get(self.tetromino.cell, ROTATIONS[new_rotation])
+        new_field = deepcopy(self)
+        for row_kick, column_kick in kicks:
+            offset_row, offset_column = self.offset_row + row_kick, self.offset_column + column_kick
+            if self._are_offsets_valid(offset_row, offset_column, new_tetromino):
+                new_field.tetromino = new_tetromino
+                new_field.offset_row, new_field.offset_column = offset_row, offset_column
+                break
+        return new_field
 
     def _execute_move_left(self):
         """Return a new FieldWithTetromino with my Tetromino moved left one Cell if possible by adjusting offsets."""
@@ -374,14 +870,29 @@ class FieldWithTetromino(Field):
         Does NOT place my Tetromino.
         """
         new_field = deepcopy(self)
-        for row in range(1, self.height):
-            if not new_field._adopt_offsets_if_valid(self.offset_row + row, self.offset_column):
-                return new_field
+        _, new_field.offset_row, _ = self._get_hard_drop_state()
+        return new_field
 
     def _execute_hard_drop_and_place_tetromino(self):
         """Returns a new Field with my Tetromino moved as far down as possible by adjusting offsets then placed."""
-        new_field = self._execute_hard_drop()
-        return new_field._place_tetromino()
+        return self._place_tetromino(state=self._get_hard_drop_state())
+
+    def _get_hard_drop_state(self):
+        """
+        Return the (Tetromino, offset_row, offset_column) state of my Tetromino moved as far down as possible,
+        computed with get_drop_distance once it is in a valid position.
+        """
+        if not self.are_current_offsets_valid():
+            # A Tetromino overlapping nonempty Cells only falls if the row below is free, as StateMoves.hard_drop
+            if not self._are_offsets_valid(self.offset_row + 1, self.offset_column):
+                return self.tetromino, self.offset_row, self.offset_column
+            return self._get_hard_drop_state_from(self.offset_row + 1)
+        return self._get_hard_drop_state_from(self.offset_row)
+
+    def _get_hard_drop_state_from(self, offset_row):
+        """Return the state of _get_hard_drop_state for my Tetromino in the valid position at OFFSET_ROW."""
+        drop_distance = get_drop_distance(self.get_column_bitmask, self.tetromino, offset_row, self.offset_column)
+        return self.tetromino, offset_row + drop_distance, self.offset_column
 
     def _execute_rotate_cw(self):
         """Return a new FieldWithTetromino with my Tetromino rotated clockwise and kicked appropriately."""
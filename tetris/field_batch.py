@@ -0,0 +1,130 @@
+import numpy as np
+
+from cell import Cell
+from field import Field, ZOBRIST_KEYS
+from fumen import Fumen
+
+CELLS = tuple(Cell)
+ZOBRIST_KEY_ARRAY = np.array(ZOBRIST_KEYS, dtype=np.uint64)
+
+
+class FieldBatch:
+    """
+    A batch of N Fields stored as an (N, 24, 10) uint8 array CELLS of Cell values,
+    so that operations over many Fields at once, e.g. every possible next Field of a move, are a few array operations.
+    Requires NumPy.
+
+    Unlike a Field, the queries return one result per Field as an array indexed like my Fields.
+    """
+    width = Field.width
+    height = Field.height
+
+    def __init__(self, cells=None):
+        """
+        Initialise my CELLS to the array-like CELLS of shape (N, 24, 10).
+        If CELLS is not provided, initialise an empty batch of no Fields.
+        """
+        if cells is None:
+            cells = np.zeros((0, self.height, self.width), dtype=np.uint8)
+        self.cells = np.array(cells, dtype=np.uint8)
+        assert self.cells.ndim == 3 and self.cells.shape[1:] == (self.height, self.width)
+
+    @staticmethod
+    def from_fields(fields):
+        """Return a FieldBatch of the Fields in FIELDS in that order."""
+        fields = list(fields)
+        values = np.fromiter((cell.value for field in fields for row in range(field.height)
+                              for cell in field.get_row(row)), dtype=np.uint8, count=len(fields) * 240)
+        return FieldBatch(values.reshape(len(fields), FieldBatch.height, FieldBatch.width))
+
+    @staticmethod
+    def from_fumen(fumen_code):
+        """Return a FieldBatch of the Fields obtained from decoding FUMEN_CODE."""
+        return FieldBatch.from_fields(Fumen.decode(fumen_code))
+
+    def to_fields(self):
+        """Return a list of my Fields as new Field objects."""
+        return [Field([[CELLS[value] for value in row] for row in field]) for field in self.cells.tolist()]
+
+    def to_fumen(self):
+        """Return the Fumen code obtained by encoding my Fields."""
+        return Fumen.encode(self.to_fields())
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.to_fields())
+
+    def __getitem__(self, index):
+        """Return the Field at the int INDEX, or a FieldBatch of the Fields selected by a slice, mask or index array."""
+        if isinstance(index, (int, np.integer)):
+            return Field([[CELLS[value] for value in row] for row in self.cells[index].tolist()])
+        return FieldBatch(self.cells[index])
+
+    def __repr__(self):
+        return self.to_fumen()
+
+    ###########
+    # Queries #
+    ###########
+
+    def get_occupancy(self):
+        """Return an (N, 24, 10) bool array which is True where the Cell is nonempty."""
+        return self.cells != Cell.EMPTY.value
+
+    def get_row_counts(self):
+        """Return an (N, 24) array of the number of nonempty Cells in each row of each Field."""
+        return self.get_occupancy().sum(axis=2)
+
+    def get_num_nonempty_cells(self):
+        """Return an (N,) array of the number of nonempty Cells in each Field."""
+        return self.get_occupancy().sum(axis=(1, 2))
+
+    def get_column_heights(self):
+        """Return an (N, 10) array of column heights as defined by Field.get_column_height."""
+        visible_occupancy = self.get_occupancy()[:, :self.height - 1]
+        topmost_rows = visible_occupancy.argmax(axis=1)
+        return np.where(visible_occupancy.any(axis=1), self.height - 1 - topmost_rows, 0)
+
+    def is_visibly_empty(self):
+        """Return an (N,) bool array which is True where the visible field is completely empty."""
+        return ~self.get_occupancy()[:, 3:self.height - 1].any(axis=(1, 2))
+
+    def get_bottommost_visible_empty_row(self):
+        """Return an (N,) array of the bottommost empty row above the hidden bottom row of each Field, or -1."""
+        empty_rows = ~self.get_occupancy()[:, :self.height - 1].any(axis=2)
+        bottommost_rows = self.height - 2 - empty_rows[:, ::-1].argmax(axis=1)
+        return np.where(empty_rows.any(axis=1), bottommost_rows, -1)
+
+    def get_zobrist_hashes(self):
+        """Return an (N,) uint64 array of the Zobrist hashes of my Fields, equal to their Field.zobrist_hash."""
+        keys = ZOBRIST_KEY_ARRAY[np.arange(self.height * self.width), self.cells.reshape(len(self), -1)]
+        return np.bitwise_xor.reduce(keys, axis=1) if len(self) else np.zeros(0, dtype=np.uint64)
+
+    ##############
+    # Operations #
+    ##############
+
+    def line_clear(self):
+        """
+        Remove completely filled rows from each of my Fields and add empty rows from the top.
+        Return an (N,) array of the number of rows removed from each Field.
+        """
+        filled_rows = self.get_occupancy().all(axis=2)
+        lines_cleared = filled_rows.sum(axis=1)
+        if lines_cleared.any():
+            # Stable sort moves filled rows to the top and keeps the order of the remaining rows
+            order = np.argsort(~filled_rows, axis=1, kind="stable")
+            self.cells = self.cells[np.arange(len(self))[:, np.newaxis], order]
+            self.cells[np.arange(self.height) < lines_cleared[:, np.newaxis]] = Cell.EMPTY.value
+        return lines_cleared
+
+    def convert_cells_to_grey(self):
+        """Return a new FieldBatch where all nonempty cells are converted to GREY."""
+        return FieldBatch(np.where(self.get_occupancy(), Cell.GREY.value, Cell.EMPTY.value))
+
+    def unique(self):
+        """Return a new FieldBatch of my distinct Fields in the order they first appear."""
+        _, indices = np.unique(self.cells.reshape(len(self), -1), axis=0, return_index=True)
+        return FieldBatch(self.cells[np.sort(indices)])
@@ -0,0 +1,99 @@
+from weakref import WeakValueDictionary
+
+from cell import Cell
+from field import Field
+
+
+class FrozenField(Field):
+    """
+    An immutable Field whose rows are tuples of Cells. Its Zobrist hash is computed once on creation
+    and its canonical form once on first use.
+
+    FrozenFields are interned: creating a FrozenField equal to one that is still alive returns that same object,
+    so equal snapshots held by game histories, successor sets and Q-value tables share memory
+    and compare equal by identity.
+    """
+    __slots__ = ("canonical_form", "__weakref__")
+
+    # Map from Zobrist hash to the live FrozenField with that hash
+    interned = WeakValueDictionary()
+
+    def __new__(cls, field=None):
+        """
+        Return the interned FrozenField with the same Cells as FIELD,
+        which is either a Field or a list of lists of Cells.
+        If FIELD is not provided, return the empty FrozenField.
+        """
+        if isinstance(field, FrozenField):
+            return field
+        if field is None:
+            field = Field()
+        if isinstance(field, Field):
+            rows = tuple(tuple(field.get_row(row)) for row in range(field.height))
+            zobrist_hash = field.zobrist_hash
+        else:
+            rows = tuple(tuple(row) for row in field)
+            zobrist_hash = None
+
+        new_field = object.__new__(cls)
+        object.__setattr__(new_field, "field", rows)
+        row_counts = tuple(Field.width - row.count(Cell.EMPTY) for row in rows)
+        object.__setattr__(new_field, "row_counts", row_counts)
+        object.__setattr__(new_field, "num_nonempty_cells", sum(row_counts))
+        object.__setattr__(new_field, "column_heights", tuple(new_field._compute_column_heights()))
+        if zobrist_hash is None:
+            zobrist_hash = new_field._get_rows_zobrist_key(new_field.height)
+        object.__setattr__(new_field, "zobrist_hash", zobrist_hash)
+
+        interned_field = cls.interned.get(zobrist_hash)
+        if interned_field is None:
+            cls.interned[zobrist_hash] = new_field
+        elif interned_field.field == rows:
+            return interned_field
+        return new_field    # Zobrist hash collision, leave uninterned
+
+    def __init__(self, field=None):
+        """I am initialised by __new__."""
+        pass
+
+    def __setattr__(self, name, value):
+        raise TypeError("FrozenField is immutable")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        """Return True if the OTHER field has the same Cells as mine."""
+        assert isinstance(other, Field)
+        if self is other:
+            return True
+        if self.zobrist_hash != other.zobrist_hash:
+            return False
+        if isinstance(other, FrozenField):
+            return self.field == other.field
+        return all(self.field[row] == tuple(other.get_row(row)) for row in range(self.height))
+
+    __hash__ = Field.__hash__
+
+    def get_canonical_form(self):
+        """Return the tuple of Field.get_canonical_form with my canonical form as a FrozenField, computed once."""
+        try:
+            return self.canonical_form
+        except AttributeError:
+            canonical_field, is_mirrored = super().get_canonical_form()
+            canonical_form = (FrozenField(canonical_field), is_mirrored)
+            object.__setattr__(self, "canonical_form", canonical_form)
+            return canonical_form
+
+    def set_cell(self, row, column, cell):
+        raise TypeError("FrozenField is immutable")
+
+    def line_clear(self, rows=None):
+        raise TypeError("FrozenField is immutable")
+
+    def convert_cells_to_grey(self):
+        """Return the FrozenField where all my nonempty cells are converted to GREY."""
+        return FrozenField(super().convert_cells_to_grey())
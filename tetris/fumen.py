@@ -102,7 +102,7 @@ class Fumen:
     @staticmethod
     def encode(list_of_fields):
         """
-        Return the Fumen code obtained by encoding LIST_OF_FIELDS.
+        Return the Fumen code obtained by encoding LIST_OF_FIELDS, which may be any iterable of Fields.
         This does not implement the shorthand for multiple repeated Fields and
         instead uses "vhA" + ["AgH" or "AAA"] for each consecutive pair.
         The original Fumen is able to decode these codes but will encode them with the shorthand.
@@ -128,9 +128,7 @@ class Fumen:
         prev_field = BLANK_FIELD
         flags_inserted = False  # have I used "AgH"
 
-        while list_of_fields:
-            curr_field = list_of_fields[0]
-
+        for curr_field in list_of_fields:
             # Compute (diff, count) pairs
             difference_from_prev_field = compute_difference_fields(curr_field, prev_field)
 
@@ -149,6 +147,5 @@ class Fumen:
                 fumen_code.append(Fumen.SUFFIX)
 
             prev_field = curr_field
-            list_of_fields = list_of_fields[1:]
 
         return "".join(fumen_code)
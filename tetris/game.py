@@ -1,8 +1,9 @@
 from cell import Cell
 from control import Control
 from database import pc_mode_fetch_possible_next_fields
-from field import Field
+from frozen_field import FrozenField
 from fumen import Fumen
+from history import FieldHistory
 from itertools import product
 from randomizer import SevenBagRandomizer
 
@@ -15,8 +16,8 @@ class Game:
     """Integrate Field and Randomizer and handle game settings."""
 
     def __init__(self, randomizer_type=SevenBagRandomizer, seed=None):
-        # Fields
-        self.field = Field()
+        # Fields are frozen so that my history and state representations share interned snapshots
+        self.field = FrozenField()
 
         # Randomizer
         self.randomizer = randomizer_type(seed)
@@ -37,11 +38,27 @@ class Game:
         self.next_fields = self.get_possible_next_fields()
         self.check_and_set_has_game_ended()
 
-        self.history = [self.field]
+        self.history = FieldHistory(self.field)
 
     def __repr__(self):
         return str(self.get_state_representation())
 
+    def __getstate__(self):
+        """
+        Pickle me as a small tuple. My Fields are pickled as bytes, see Field.to_bytes,
+        and my possible next Fields are computed again when I am unpickled.
+        """
+        return (self.field, self.num_pieces_placed, self.queue_visibility, bytes(cell.value for cell in self.queue),
+                self.is_hold_enabled, self.hold_piece.value, self.has_held_once, self.has_game_ended, self.randomizer,
+                self.history)
+
+    def __setstate__(self, state):
+        self.field, self.num_pieces_placed, self.queue_visibility, queue, self.is_hold_enabled, hold_value, \
+            self.has_held_once, self.has_game_ended, self.randomizer, self.history = state
+        self.queue = [Cell(value) for value in queue]
+        self.hold_piece = Cell(hold_value)
+        self.next_fields = self.get_possible_next_fields()
+
     def get_available_controls(self):
         """Return a set of available controls."""
         if self.has_game_ended:
@@ -58,6 +75,25 @@ class Game:
             fields.add(self.field)
         return fields
 
+    def iter_possible_next_fields(self):
+        """
+        Yield the Fields of get_possible_next_fields, each once, starting with the current Field if holding is
+        possible then placing the current piece as the search finds them, so that a caller can stop early.
+        """
+        if not self.has_held_once:
+            yield self.field
+        # A placement never gives the current Field back as it adds Cells or clears at least a row
+        fwt = self.field.spawn_tetromino(self.queue[0])
+        yield from fwt.iter_possible_fields(convert_to_grey=True)
+
+    def get_num_possible_next_fields(self):
+        """
+        Return the number of Fields of get_possible_next_fields, making only the Fields of the placements that
+        clear lines, see FieldWithTetromino.get_num_possible_fields.
+        """
+        fwt = self.field.spawn_tetromino(self.queue[0])
+        return fwt.get_num_possible_fields(convert_to_grey=True) + (not self.has_held_once)
+
     def advance_to_field(self, field):
         """
         Change my current field to FIELD assuming it is a possible option.
@@ -75,7 +111,7 @@ class Game:
             else:
                 self.hold_piece, self.queue[0] = self.queue[0], self.hold_piece
         else:
-            self.field = field
+            self.field = FrozenField(field)
 
             self.num_pieces_placed += 1
 
@@ -165,10 +201,24 @@ class PCMode(Game):
         self.pc_number = 1
         self.num_pieces_placed_since_last_pc = 0
 
+    def __getstate__(self):
+        return super().__getstate__() + (self.num_pcs, self.pc_number, self.num_pieces_placed_since_last_pc)
+
+    def __setstate__(self, state):
+        self.num_pcs, self.pc_number, self.num_pieces_placed_since_last_pc = state[-3:]
+        super().__setstate__(state[:-3])
+
     def get_possible_next_fields(self):
         """Return a set of possible Fields using the current piece plus the current Field if holding is possible."""
         return pc_mode_fetch_possible_next_fields(self.field, self.queue[0])
 
+    def iter_possible_next_fields(self):
+        """Yield the Fields of get_possible_next_fields, which are fetched all at once from the database."""
+        return iter(self.get_possible_next_fields())
+
+    def get_num_possible_next_fields(self):
+        return len(self.get_possible_next_fields())
+
     def set_pc_number(self):
         """Called only when my Field is empty."""
         self.pc_number = (self.num_pieces_placed * 5) % 7 + 1
@@ -198,6 +248,13 @@ class GameWithControls(Game):
         super().__init__()
         self.fwt = None
 
+    def __getstate__(self):
+        return super().__getstate__() + (self.fwt,)
+
+    def __setstate__(self, state):
+        self.fwt = state[-1]
+        super().__setstate__(state[:-1])
+
     def spawn_tetromino(self):
         """Spawn Tetromino into my Field and store as my FWT. Does not remove next piece from my queue."""
         next_piece = self.queue[0]
@@ -205,6 +262,16 @@ class GameWithControls(Game):
         if not self.fwt.are_current_offsets_valid():
             self.has_game_ended = True
 
+    def get_possible_fields_with_controls(self):
+        """
+        Return a dict of the Fields where my current piece can be placed to a shortest list of Controls
+        that places it there with execute_controls, see FieldWithTetromino.get_possible_fields_with_controls.
+        Spawn my Tetromino first if it has not been spawned.
+        """
+        if self.fwt is None:
+            self.spawn_tetromino()
+        return self.fwt.get_possible_fields_with_controls()
+
     ####################
     # Control handling #
     ####################
@@ -0,0 +1,133 @@
+from itertools import combinations, islice
+
+from cell import Cell
+from field import Field, MAX_LINES_CLEARED
+from frozen_field import FrozenField
+from fumen import Fumen
+
+CHECKPOINT_INTERVAL = 32
+
+
+class FieldHistory:
+    """
+    The sequence of Fields of a Game, stored as my first Field and one delta per later Field.
+    A delta is a tuple of the Cells placed, as (row, column, Cell) tuples, and the rows cleared afterwards,
+    so a placement is kept in a few dozen bytes instead of a 240-Cell Field.
+    Fields that are not one placement away from the previous Field are kept whole as FrozenFields instead.
+
+    Fields are rebuilt on demand as FrozenFields. Every CHECKPOINT_INTERVAL-th Field is kept whole in my CHECKPOINTS
+    so that indexing replays at most CHECKPOINT_INTERVAL deltas. My last Field is kept so that appending and indexing
+    the current Field are cheap.
+    """
+
+    def __init__(self, field=None):
+        """Initialise my history to the single FIELD, or the empty Field if FIELD is not provided."""
+        self.base_field = FrozenField(field)
+        self.last_field = self.base_field
+        self.deltas = []
+        self.checkpoints = [self.base_field]    # The Fields at indices 0, CHECKPOINT_INTERVAL, ...
+
+    def __repr__(self):
+        return self.to_fumen()
+
+    def __len__(self):
+        return len(self.deltas) + 1
+
+    def __iter__(self):
+        """Yield my Fields in order, rebuilding each from the previous one."""
+        return self._iter_from(0)
+
+    def __getitem__(self, index):
+        """Return the Field at INDEX or a list of the Fields in the slice INDEX."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step < 0:
+                return list(self)[index]
+            return list(islice(self._iter_from(start), 0, max(0, stop - start), step)) if start < len(self) else []
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FieldHistory index out of range")
+        if index == len(self) - 1:
+            return self.last_field
+        return next(self._iter_from(index))
+
+    def append(self, field):
+        """Add FIELD to the end of my history."""
+        field = FrozenField(field)
+        delta = get_placement_delta(self.last_field, field)
+        self.deltas.append(field if delta is None else delta)
+        self.last_field = field
+        if len(self.deltas) % CHECKPOINT_INTERVAL == 0:
+            self.checkpoints.append(field)
+
+    def to_fumen(self):
+        """Return the Fumen code of my Fields without keeping them all alive at once."""
+        return Fumen.encode(iter(self))
+
+    def _iter_from(self, index):
+        """Yield my Fields from INDEX on, rebuilding them from the checkpoint at or before INDEX."""
+        checkpoint_index = index - index % CHECKPOINT_INTERVAL
+        checkpoint = self.checkpoints[checkpoint_index // CHECKPOINT_INTERVAL]
+        if checkpoint_index == index:
+            yield checkpoint
+        field = Field(checkpoint.field)
+        for i, delta in enumerate(self.deltas[checkpoint_index:], checkpoint_index + 1):
+            if isinstance(delta, FrozenField):
+                field = Field(delta.field)
+                if i >= index:
+                    yield delta
+            else:
+                placed_cells, cleared_rows = delta
+                for row, column, cell in placed_cells:
+                    field.set_cell(row, column, cell)
+                field.line_clear(cleared_rows)
+                if i >= index:
+                    yield FrozenField(field)
+
+
+def get_placement_delta(field, next_field):
+    """
+    Return a tuple of the (row, column, Cell) tuples placed on FIELD and the rows cleared afterwards
+    that turn FIELD into NEXT_FIELD,
+    or None if NEXT_FIELD cannot be reached by placing Cells then clearing up to MAX_LINES_CLEARED lines.
+    Placed Cells in cleared rows are only known to be nonempty and are GREY.
+    """
+    num_placed_cells = next_field.get_num_nonempty_cells() - field.get_num_nonempty_cells()
+    for lines_cleared in range(MAX_LINES_CLEARED + 1):
+        num_placed_cells_with_cleared = num_placed_cells + lines_cleared * field.width
+        if num_placed_cells_with_cleared < 0:
+            continue
+        # A cleared row must have been filled by the placed Cells
+        candidate_rows = [row for row in range(field.height)
+                          if field.width - field.get_row_count(row) <= num_placed_cells_with_cleared]
+        for cleared_rows in combinations(candidate_rows, lines_cleared):
+            placed_cells = _get_placed_cells(field, next_field, cleared_rows)
+            if placed_cells is not None:
+                return placed_cells, cleared_rows
+    return None
+
+
+def _get_placed_cells(field, next_field, cleared_rows):
+    """
+    Return a tuple of the (row, column, Cell) tuples placed on FIELD that turn it into NEXT_FIELD
+    once CLEARED_ROWS are cleared, or None if there are none.
+    """
+    lines_cleared = len(cleared_rows)
+    if any(not next_field.is_row_empty(row) for row in range(lines_cleared)):
+        return None
+    placed_cells = []
+    cleared_cells = []
+    for row in reversed(range(field.height)):
+        old_row = field.get_row(row)
+        if row in cleared_rows:
+            cleared_cells.extend((row, column) for column, cell in enumerate(old_row) if cell.is_empty())
+            continue
+        new_row = next_field.get_row(row + sum(cleared_row > row for cleared_row in cleared_rows))
+        for column, (old_cell, new_cell) in enumerate(zip(old_row, new_row)):
+            if old_cell.is_empty():
+                if not new_cell.is_empty():
+                    placed_cells.append((row, column, new_cell))
+            elif old_cell is not new_cell:
+                return None
+    return tuple(placed_cells + [(row, column, Cell.GREY) for row, column in cleared_cells])
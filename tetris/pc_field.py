@@ -0,0 +1,159 @@
+from bitboard_field import FULL_ROW
+from cell import Cell
+from field import Field, get_column_bitmasks, get_drop_distance
+from fumen import Fumen
+from placement_search import StateMoves, get_landed_states
+from rotation import ROTATIONS
+from rotation_system import SuperRotationSystem
+from tetromino import Tetromino
+
+# The topmost Field row of the perfect clear area. The area ends at the bottom of the visible field.
+TOP_ROW = Field.height - 1 - 4
+
+
+class PCField:
+    """
+    The bottom four visible rows of a Field of GREY Cells, which is all a perfect clear ever needs, as one 40-bit int.
+    Bit 10 * row + column of my BITS is set if and only if the Cell at row and column is nonempty,
+    where row 0 is the topmost of my four rows and Field row TOP_ROW.
+
+    PCFields are immutable. Tetromino moves are searched with shifts and masked ANDs against my bits
+    and lines are cleared by compacting my row masks.
+    """
+    __slots__ = ("bits",)
+
+    width = Field.width
+    height = 4
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @staticmethod
+    def fits(field):
+        """Return True if FIELD has no nonempty Cells outside of my four rows."""
+        return all(field.is_row_empty(row) for row in range(field.height)
+                   if not TOP_ROW <= row < TOP_ROW + PCField.height)
+
+    @staticmethod
+    def from_field(field):
+        """
+        Return the PCField with the nonempty Cells of FIELD.
+        Raise ValueError if FIELD does not fit, see fits.
+        """
+        if not PCField.fits(field):
+            raise ValueError("Field does not fit in the perfect clear area")
+        bits = 0
+        for row in range(TOP_ROW, TOP_ROW + PCField.height):
+            bits |= field.get_row_bitmask(row) << (row - TOP_ROW) * PCField.width
+        return PCField(bits)
+
+    @staticmethod
+    def from_fumen(fumen_code):
+        """Return the PCField of the first Field obtained from decoding FUMEN_CODE."""
+        return PCField.from_field(Fumen.decode(fumen_code)[0])
+
+    def to_field(self):
+        """Return the Field with GREY Cells where I have nonempty Cells."""
+        field = Field()
+        for row in range(self.height):
+            row_mask = self.get_row_bitmask(row)
+            for column in range(self.width):
+                if row_mask >> column & 1:
+                    field.set_cell(TOP_ROW + row, column, Cell.GREY)
+        return field
+
+    def to_fumen(self):
+        return Fumen.encode([self.to_field()])
+
+    def __repr__(self):
+        return self.to_fumen()
+
+    def __eq__(self, other):
+        assert isinstance(other, PCField)
+        return self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    ###########
+    # Queries #
+    ###########
+
+    def get_row_bitmask(self, row):
+        """Return an int whose bit i is set if and only if the Cell in column i of ROW is nonempty."""
+        return self.bits >> row * self.width & FULL_ROW
+
+    def is_empty(self):
+        return not self.bits
+
+    ##############
+    # Operations #
+    ##############
+
+    def line_clear(self):
+        """Return a tuple of the PCField with my filled rows removed and the number of rows removed."""
+        row_masks = [self.get_row_bitmask(row) for row in range(self.height)]
+        kept_row_masks = [row_mask for row_mask in row_masks if row_mask != FULL_ROW]
+        lines_cleared = self.height - len(kept_row_masks)
+        bits = 0
+        for row, row_mask in enumerate(kept_row_masks, lines_cleared):
+            bits |= row_mask << row * self.width
+        return PCField(bits), lines_cleared
+
+    def get_possible_fields(self, cell, rotation_system=SuperRotationSystem):
+        """
+        Return the set of PCFields obtained by placing the Tetromino of CELL anywhere it can reach from its spawn
+        position, as Field.get_possible_fields_below_height(4, convert_to_grey=True) does for my Field.
+        """
+        # My Cells on the rows of a Field. Rows above mine are empty.
+        board = self.bits << TOP_ROW * self.width
+        spawn_tetromino = Tetromino.get(cell, rotation_system.get_spawn_rotation())
+        tetrominos = tuple(Tetromino.get(cell, rotation) for rotation in ROTATIONS)    # By Rotation value
+
+        def get_placed_mask(rotation, offset_row, offset_column):
+            """Return the mask of the Tetromino with OFFSETS on the rows of a Field, or None if it is out of bounds."""
+            tetromino = tetrominos[rotation]
+            min_row, max_row, min_column, max_column = tetromino.bounding_box
+            if not (0 <= offset_row + min_row and offset_row + max_row < Field.height - 1 and
+                    0 <= offset_column + min_column and offset_column + max_column < self.width):
+                return None
+            shift = offset_row * self.width + offset_column
+            return tetromino.mask << shift if shift >= 0 else tetromino.mask >> -shift
+
+        def is_valid(state):
+            placed_mask = get_placed_mask(*state)
+            return placed_mask is not None and not placed_mask & board
+
+        column_bitmasks = get_column_bitmasks(board >> row * self.width & FULL_ROW for row in range(Field.height))
+
+        def get_state_drop_distance(state):
+            rotation, offset_row, offset_column = state
+            return get_drop_distance(column_bitmasks.__getitem__, tetrominos[rotation], offset_row, offset_column)
+
+        # Start from the same position as FieldWithTetromino.get_possible_fields
+        offset_row, offset_column = rotation_system.get_spawn_offsets(spawn_tetromino)
+        start_state = (spawn_tetromino.rotation.value, offset_row, offset_column)
+        bottommost_empty_row = next((TOP_ROW + row for row in reversed(range(self.height))
+                                     if not self.get_row_bitmask(row)), TOP_ROW - 1)
+
+        fields = set()
+        moves = StateMoves(cell, is_valid, get_state_drop_distance, rotation_system)
+        soft_drops = moves.get_soft_drops(start_state, bottommost_empty_row)
+        for state in get_landed_states(moves, start_state, soft_drops):
+            rotation, offset_row, offset_column = state
+            placed_board = board | get_placed_mask(*state)
+            min_row, max_row, _, _ = tetrominos[rotation].bounding_box
+            # Only the rows of the Tetromino are cleared
+            kept_row_masks = []
+            for row in range(min(TOP_ROW, offset_row + min_row), Field.height - 1):
+                row_mask = placed_board >> row * self.width & FULL_ROW
+                if row_mask != FULL_ROW or not offset_row + min_row <= row <= offset_row + max_row:
+                    kept_row_masks.append(row_mask)
+            if any(kept_row_masks[:-self.height]):
+                continue    # Too high
+            kept_row_masks = [0] * self.height + kept_row_masks
+            bits = 0
+            for row, row_mask in enumerate(kept_row_masks[-self.height:]):
+                bits |= row_mask << row * self.width
+            fields.add(PCField(bits))
+        return fields
@@ -0,0 +1,44 @@
+from tetromino import MASK_WIDTH, Tetromino
+
+
+class Placement:
+    """
+    A Tetromino of CELL with ROTATION placed on a Field with OFFSETS, kept as these four values
+    until its Field is wanted, see FieldWithTetromino.get_placement_field.
+
+    Placements are equal if they place the same Cell on the same Cells of the Field,
+    e.g. I in rotation NORTH and in rotation SOUTH one column to the right.
+    My CELLS_MASK has bit 10 * row + column set for each Cell of the Field that I occupy.
+    """
+    __slots__ = ("cell", "rotation", "offset_row", "offset_column", "cells_mask")
+
+    def __init__(self, cell, rotation, offset_row, offset_column):
+        self.cell = cell
+        self.rotation = rotation
+        self.offset_row = offset_row
+        self.offset_column = offset_column
+        mask = self.get_tetromino().mask
+        shift = offset_row * MASK_WIDTH + offset_column
+        self.cells_mask = mask << shift if shift >= 0 else mask >> -shift
+
+    def __repr__(self):
+        return "Placement({0}, {1}, {2}, {3})".format(self.cell.name, self.rotation.name, self.offset_row,
+                                                     self.offset_column)
+
+    def __eq__(self, other):
+        assert isinstance(other, Placement)
+        return self.cell is other.cell and self.cells_mask == other.cells_mask
+
+    def __hash__(self):
+        return hash(self.cells_mask)
+
+    def __reduce__(self):
+        return Placement, (self.cell, self.rotation, self.offset_row, self.offset_column)
+
+    def get_tetromino(self):
+        return Tetromino.get(self.cell, self.rotation)
+
+    def get_nonempty_coords(self):
+        """Return a set of (row, column) coordinates of the Cells of the Field that I occupy."""
+        return {(row + self.offset_row, column + self.offset_column)
+                for row, column in self.get_tetromino().nonempty_coords}
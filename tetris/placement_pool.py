@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from cell import Cell
+from field import Field
+from placement import Placement
+from rotation import ROTATIONS
+
+# Number of jobs sent to a worker process at a time
+CHUNK_SIZE = 16
+
+
+class PlacementPool:
+    """
+    A pool of worker processes that finds the possible Fields of many (Field, Cell) jobs in parallel,
+    as FieldWithTetromino.get_possible_fields does for one, e.g. to warm the move cache over thousands of Fields.
+
+    Jobs are sent to the workers my CHUNK_SIZE at a time as Field.to_bytes and Cell values rather than pickled Fields.
+    The workers only search, which is most of the work, and send back the Placements found as
+    (Rotation value, offset_row, offset_column) tuples. The Fields are then made here, which is cheaper than
+    decoding Fields sent back as bytes. Results are returned in the order of the jobs.
+    Shut me down when done, or use me in a with statement.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=CHUNK_SIZE):
+        """Start MAX_WORKERS worker processes, or one per CPU if MAX_WORKERS is not provided."""
+        self.executor = ProcessPoolExecutor(max_workers)
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+    def get_possible_fields(self, jobs, convert_to_grey=False, height=None):
+        """
+        Return a list of the sets of possible Fields of each (Field, Cell) job of JOBS in order,
+        as the FieldWithTetromino of the Cell spawned on the Field gives with get_possible_fields(CONVERT_TO_GREY),
+        or with get_possible_fields_below_height(HEIGHT, CONVERT_TO_GREY) if HEIGHT is provided.
+        """
+        jobs = list(jobs)
+        payloads = [(field.to_bytes(), cell.value, height) for field, cell in jobs]
+        results = self.executor.map(get_possible_placements_from_payload, payloads, chunksize=self.chunk_size)
+        possible_fields = []
+        for (field, cell), result in zip(jobs, results):
+            placements = [Placement(cell, ROTATIONS[rotation_value], offset_row, offset_column)
+                          for rotation_value, offset_row, offset_column in result]
+            possible_fields.append(field.spawn_tetromino(cell).get_placement_fields(placements, convert_to_grey))
+        return possible_fields
+
+    def get_possible_next_fields_of_games(self, games):
+        """
+        Return a list of the sets of possible next Fields of each Game of GAMES in order, as Game.get_possible_next_fields.
+        PCModes fetch theirs from the database instead, see pc_mode_fetch_possible_next_fields_of_many.
+        """
+        games = list(games)
+        next_fields = self.get_possible_fields([(game.field, game.queue[0]) for game in games], convert_to_grey=True)
+        for game, fields in zip(games, next_fields):
+            if not game.has_held_once:
+                fields.add(game.field)
+        return next_fields
+
+
+def get_possible_placements_from_payload(payload):
+    """
+    Return a tuple of the (Rotation value, offset_row, offset_column) tuples of the possible Placements of the job in
+    PAYLOAD, a tuple of the Field.to_bytes of a Field, a Cell value and HEIGHT as in PlacementPool.get_possible_fields.
+    Runs in a worker process.
+    """
+    field_data, cell_value, height = payload
+    fwt = Field.from_bytes(field_data).spawn_tetromino(Cell(cell_value))
+    return tuple((placement.rotation.value, placement.offset_row, placement.offset_column)
+                 for placement in fwt.get_possible_placements(height=height))
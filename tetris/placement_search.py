@@ -0,0 +1,294 @@
+from control import Control
+from rotation import ROTATIONS, Rotation
+from rotation_system import ROTATION_DIRECTIONS
+from tetromino import Tetromino
+
+ROTATION_CONTROLS = {Control.ROTATE_CW, Control.ROTATE_CCW, Control.ROTATE_180}
+
+# Indices of the rotation Controls in ROTATION_DIRECTIONS
+CW, CCW, ROTATE_180 = (ROTATION_DIRECTIONS.index(control)
+                       for control in [Control.ROTATE_CW, Control.ROTATE_CCW, Control.ROTATE_180])
+
+# Cache of get_symmetries
+symmetries_cache = dict()
+
+# Cache of get_rotation_clearance
+rotation_clearances = dict()
+
+
+def get_symmetries(cell, rotation_system):
+    """
+    Return a dict of each Rotation of the Tetromino of CELL that has a symmetric Rotation
+    to a (Rotation, row_change, column_change) tuple, such that the Tetromino in any (Rotation, offset_row,
+    offset_column) state occupies the same Cells as in the state with the symmetric Rotation and the changed offsets
+    and behaves exactly like it under ROTATION_SYSTEM. The symmetric Rotation is the first such Rotation.
+
+    Occupying the same Cells is not enough. Under SRS, I, S and Z in NORTH and SOUTH occupy the same Cells
+    but kick onto different Cells when rotated, so only the rotations of O are symmetric.
+    States are only symmetric if every kick test of every rotation gives symmetric states again,
+    so the largest such relation is found by discarding pairs of Rotations until none fails.
+    """
+    key = (cell, rotation_system)
+    if key in symmetries_cache:
+        return symmetries_cache[key]
+
+    tetrominos = {rotation: Tetromino.get(cell, rotation) for rotation in Rotation}
+
+    def get_translation(rotation, other_rotation):
+        """Return the offset changes that move the Tetromino onto the same Cells in OTHER_ROTATION, or None."""
+        coords = tetrominos[rotation].nonempty_coords
+        other_coords = tetrominos[other_rotation].nonempty_coords
+        row_change = min(coords)[0] - min(other_coords)[0]
+        column_change = min(column for _, column in coords) - min(column for _, column in other_coords)
+        if {(row - row_change, column - column_change) for row, column in coords} != other_coords:
+            return None
+        return row_change, column_change
+
+    translations = {(rotation, other_rotation): get_translation(rotation, other_rotation)
+                    for rotation in Rotation for other_rotation in Rotation}
+    symmetric_pairs = {pair for pair, translation in translations.items() if translation is not None}
+
+    def is_pair_closed(rotation, other_rotation):
+        """Return True if rotating both states of the pair keeps them symmetric for every kick test."""
+        row_change, column_change = translations[(rotation, other_rotation)]
+        for control in ROTATION_CONTROLS:
+            tetromino, other_tetromino = tetrominos[rotation], tetrominos[other_rotation]
+            new_rotation = tetromino.rotate(control).rotation
+            other_new_rotation = other_tetromino.rotate(control).rotation
+            kicks = rotation_system.get_kick_tests(tetromino, control)
+            other_kicks = rotation_system.get_kick_tests(other_tetromino, control)
+            if len(kicks) != len(other_kicks):
+                return False
+            for (column_kick, row_kick), (other_column_kick, other_row_kick) in zip(kicks, other_kicks):
+                if (new_rotation, other_new_rotation) not in symmetric_pairs or \
+                        translations[(new_rotation, other_new_rotation)] != \
+                        (row_change + other_row_kick - row_kick, column_change + other_column_kick - column_kick):
+                    return False
+        return True
+
+    is_changed = True
+    while is_changed:
+        is_changed = False
+        for rotation, other_rotation in list(symmetric_pairs):
+            if (rotation, other_rotation) in symmetric_pairs and not is_pair_closed(rotation, other_rotation):
+                symmetric_pairs -= {(rotation, other_rotation), (other_rotation, rotation)}
+                is_changed = True
+
+    symmetries = dict()
+    for rotation in Rotation:
+        symmetric_rotation = next(other_rotation for other_rotation in Rotation
+                                  if (rotation, other_rotation) in symmetric_pairs)
+        if symmetric_rotation is not rotation:
+            symmetries[rotation] = (symmetric_rotation,) + translations[(rotation, symmetric_rotation)]
+    symmetries_cache[key] = symmetries
+    return symmetries
+
+
+def get_rotation_clearance(cell, rotation_system):
+    """
+    Return the number of rows below its offset_row that the Tetromino of CELL can occupy in any Rotation
+    after any kick of ROTATION_SYSTEM, so that a Tetromino with that many empty rows below its offset_row
+    rotates exactly as it would anywhere higher up.
+    """
+    key = (cell, rotation_system)
+    if key not in rotation_clearances:
+        kick_table = rotation_system.get_kick_table()[cell.value]
+        rotation_clearances[key] = max(Tetromino.get(cell, ROTATIONS[new_rotation]).bounding_box[1] + row_kick
+                                       for rotation_kicks in kick_table for new_rotation, kicks in rotation_kicks
+                                       for row_kick, _ in kicks)
+    return rotation_clearances[key]
+
+
+class StateMoves:
+    """
+    The moves of the Tetromino of a Cell over (Rotation value, offset_row, offset_column) states with a Field kept
+    fixed. IS_VALID(state) returns True if the Tetromino in a state is within the Field and not overlapping nonempty
+    Cells. GET_DROP_DISTANCE(state) returns the number of rows the Tetromino in a valid state falls when hard dropped.
+
+    The searches below only need these small tuples of ints,
+    so they are shared by every kind of Field that can answer IS_VALID and GET_DROP_DISTANCE.
+    Rotations are looked up in the kick table of the rotation system, see RotationSystem.get_kick_table.
+
+    States in symmetric Rotations, see get_symmetries, are replaced by the state in the symmetric Rotation,
+    so a symmetric Tetromino such as O is searched in one Rotation only.
+    States may therefore have a different Rotation from the Tetromino they stand for, but occupy the same Cells.
+    """
+
+    def __init__(self, cell, is_valid, get_drop_distance, rotation_system):
+        self.tetrominos = tuple(Tetromino.get(cell, rotation) for rotation in ROTATIONS)    # By Rotation value
+        self.validities = dict()    # Memo of IS_VALID
+        self.get_validity = is_valid
+        self.get_drop_distance = get_drop_distance
+        self.kick_table = rotation_system.get_kick_table()[cell.value]
+        self.rotation_clearance = get_rotation_clearance(cell, rotation_system)
+        self.symmetries = {rotation.value: (symmetric_rotation.value, row_change, column_change)
+                           for rotation, (symmetric_rotation, row_change, column_change)
+                           in get_symmetries(cell, rotation_system).items()}
+
+    def is_valid(self, state):
+        if state not in self.validities:
+            self.validities[state] = self.get_validity(state)
+        return self.validities[state]
+
+    def get_symmetric_state(self, state):
+        """Return the state in the symmetric Rotation of the Rotation of STATE, or STATE if there is none."""
+        rotation, offset_row, offset_column = state
+        if rotation not in self.symmetries:
+            return state
+        symmetric_rotation, row_change, column_change = self.symmetries[rotation]
+        return symmetric_rotation, offset_row + row_change, offset_column + column_change
+
+    def translate(self, state, row_change, column_change):
+        rotation, offset_row, offset_column = state
+        new_state = (rotation, offset_row + row_change, offset_column + column_change)
+        return new_state if self.is_valid(new_state) else state
+
+    def hard_drop(self, state):
+        """Return STATE moved as far down as possible. The Tetromino is NOT placed."""
+        if not self.is_valid(state):
+            # A start state overlapping nonempty Cells only falls if the row below is free
+            new_state = self.translate(state, 1, 0)
+            return state if new_state == state else self.hard_drop(new_state)
+        rotation, offset_row, offset_column = state
+        return rotation, offset_row + self.get_drop_distance(state), offset_column
+
+    def rotate(self, state, direction):
+        """Return STATE rotated by the Control at index DIRECTION of ROTATION_DIRECTIONS and kicked."""
+        rotation, offset_row, offset_column = state
+        new_rotation, kicks = self.kick_table[rotation][direction]
+        for row_kick, column_kick in kicks:
+            new_state = (new_rotation, offset_row + row_kick, offset_column + column_kick)
+            if self.is_valid(new_state):
+                return self.get_symmetric_state(new_state)
+        return state
+
+    def is_landed(self, state):
+        """Return True if the Tetromino can be placed on the spot in STATE. A Tetromino that can fall is floating."""
+        return self.is_valid(state) and self.translate(state, 1, 0) == state
+
+    def get_soft_drops(self, state, bottommost_empty_row):
+        """
+        Return the number of rows the Tetromino in STATE can be soft dropped before searching from it
+        without losing any placement, where every row down to BOTTOMMOST_EMPTY_ROW is empty.
+        Every Rotation and kick of the Tetromino must stay in the empty rows, see get_rotation_clearance.
+        """
+        _, offset_row, _ = state
+        return max(0, bottommost_empty_row - offset_row - self.rotation_clearance)
+
+    def get_controls_to_actions(self):
+        """Return a dict of the Controls that move the Tetromino without placing it to functions of a state."""
+        return {
+            Control.MOVE_LEFT: lambda state: self.translate(state, 0, -1),
+            Control.MOVE_RIGHT: lambda state: self.translate(state, 0, 1),
+            Control.SOFT_DROP: lambda state: self.translate(state, 1, 0),
+            Control.ROTATE_CW: lambda state: self.rotate(state, CW),
+            Control.ROTATE_CCW: lambda state: self.rotate(state, CCW)
+            # Control.ROTATE_180: lambda state: self.rotate(state, ROTATE_180)   # Not in SRS
+        }
+
+
+def get_landed_states(moves, start_state, soft_drops):
+    """
+    Return the set of states where the Tetromino of MOVES, a StateMoves, can be placed on the spot
+    that are attainable by controlling it from START_STATE, soft dropping it SOFT_DROPS times first,
+    see StateMoves.get_soft_drops.
+    """
+    return set(iter_landed_states(moves, start_state, soft_drops))
+
+
+def iter_landed_states(moves, start_state, soft_drops):
+    """
+    Yield the states of get_landed_states, each once, as the search finds them,
+    so that a caller that stops early does not search the rest.
+    """
+    # Nothing above the bottommost empty row can be in the way, so soft drop towards it first
+    start_state = moves.get_symmetric_state(start_state)
+    for _ in range(soft_drops):
+        start_state = moves.translate(start_state, 1, 0)
+
+    actions = list(moves.get_controls_to_actions().values()) + [moves.hard_drop]
+    visited = {start_state}
+    queue = [start_state]
+    # The start state may overlap nonempty Cells
+    if moves.is_landed(start_state):
+        yield start_state
+    for state in queue:
+        for action in actions:
+            next_state = action(state)
+            if next_state not in visited:
+                visited.add(next_state)
+                queue.append(next_state)
+                if moves.is_landed(next_state):
+                    yield next_state
+
+
+def get_hard_drop_states(moves, start_state):
+    """
+    Return the set of states where the Tetromino of MOVES, a StateMoves, can be placed on the spot
+    that are attainable from START_STATE by rotating and moving it sideways then hard dropping it.
+    Only the rotations and columns reachable without dropping are searched, which is at most 4 x 10 states
+    plus the rows a kick moves to, so tucks and spins under overhangs are not found.
+    """
+    return set(iter_hard_drop_states(moves, start_state))
+
+
+def iter_hard_drop_states(moves, start_state):
+    """Yield the states of get_hard_drop_states, each once, as the search finds them."""
+    controls_to_actions = moves.get_controls_to_actions()
+    actions = [action for control, action in controls_to_actions.items() if control is not Control.SOFT_DROP]
+    start_state = moves.get_symmetric_state(start_state)
+    visited = {start_state}
+    queue = [start_state]
+    landed_states = set()
+    for state in queue:
+        landed_state = moves.hard_drop(state)
+        if landed_state not in landed_states and moves.is_landed(landed_state):
+            landed_states.add(landed_state)
+            yield landed_state
+        for action in actions:
+            next_state = action(state)
+            if next_state not in visited:
+                visited.add(next_state)
+                queue.append(next_state)
+
+
+def get_landed_state_controls(moves, start_state):
+    """
+    Return a dict of the states where the Tetromino of MOVES, a StateMoves, can be placed on the spot
+    that are attainable from START_STATE to a shortest list of Controls that places it there, ending with HARD_DROP.
+    Ties are broken by fewest rotations.
+    HARD_DROP places the Tetromino, so it is only the last Control and the Tetromino falls by SOFT_DROP before that.
+    """
+    controls_to_actions = moves.get_controls_to_actions()
+    start_state = moves.get_symmetric_state(start_state)
+    costs = {start_state: (0, 0)}   # Number of Controls and number of rotations to reach each state
+    parents = {start_state: None}   # (previous state, Control) pairs of the cheapest way to reach each state
+    queue = [start_state]
+    for state in queue:
+        num_controls, num_rotations = costs[state]
+        for control, action in controls_to_actions.items():
+            next_state = action(state)
+            cost = (num_controls + 1, num_rotations + (control in ROTATION_CONTROLS))
+            if next_state not in costs:
+                queue.append(next_state)
+            elif cost >= costs[next_state]:
+                continue
+            costs[next_state] = cost
+            parents[next_state] = (state, control)
+
+    # Hard drop from every state and keep the cheapest state to drop from for each landed state
+    drop_states = dict()
+    for state, cost in costs.items():
+        landed_state = moves.hard_drop(state)
+        if moves.is_landed(landed_state) and \
+                (landed_state not in drop_states or cost < costs[drop_states[landed_state]]):
+            drop_states[landed_state] = state
+
+    landed_state_controls = dict()
+    for landed_state, state in drop_states.items():
+        controls = [Control.HARD_DROP]
+        while parents[state] is not None:
+            state, control = parents[state]
+            controls.append(control)
+        landed_state_controls[landed_state] = controls[::-1]
+    return landed_state_controls
@@ -20,4 +20,8 @@ class Rotation(Enum):
 
     def rotate_180(self):
         """Return the rotation state after rotating 180 degrees."""
-        return Rotation((self.value + 2) % 4)
\ No newline at end of file
+        return Rotation((self.value + 2) % 4)
+
+
+# Rotations indexed by their values
+ROTATIONS = tuple(sorted(Rotation, key=lambda rotation: rotation.value))
\ No newline at end of file
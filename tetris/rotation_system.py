@@ -1,9 +1,17 @@
 from itertools import permutations
 
 from cell import Cell
-from rotation import Rotation
+from control import Control
+from rotation import ROTATIONS, Rotation
+from tetromino import Tetromino, tetromino_cells
 from utils import subtract_lists_of_offsets
 
+# Rotation Controls in the order of the last index of RotationSystem.get_kick_table
+ROTATION_DIRECTIONS = (Control.ROTATE_CW, Control.ROTATE_CCW, Control.ROTATE_180)
+
+# Cache of RotationSystem.get_kick_table
+kick_tables = dict()
+
 
 class RotationSystem:
     """
@@ -47,6 +55,29 @@ class RotationSystem:
         """Return kick test offsets (dx, dy) for TETROMINO after the rotation specified by CONTROL."""
         pass
 
+    @classmethod
+    def get_kick_table(cls):
+        """
+        Return my kick tests compiled into nested tuples indexed by Cell value, Rotation value,
+        then the index of the rotation Control in ROTATION_DIRECTIONS.
+        Each entry is a tuple of the Rotation value after the rotation and a tuple of the kick translations
+        (row_change, column_change) in test order. Cells that are not Tetrominos have None.
+        The table is compiled once, so rotating by it needs no Enum arithmetic or dict lookups.
+        """
+        if cls not in kick_tables:
+            kick_tables[cls] = tuple(
+                tuple(tuple(cls._compile_kick_tests(Tetromino.get(cell, rotation), control)
+                            for control in ROTATION_DIRECTIONS) for rotation in ROTATIONS)
+                if cell in tetromino_cells else None
+                for cell in sorted(Cell, key=lambda cell: cell.value))
+        return kick_tables[cls]
+
+    @classmethod
+    def _compile_kick_tests(cls, tetromino, control):
+        """Return the entry of get_kick_table for TETROMINO and CONTROL."""
+        kicks = tuple((row_kick, column_kick) for column_kick, row_kick in cls.get_kick_tests(tetromino, control))
+        return tetromino.rotate(control).rotation.value, kicks
+
 
 class SuperRotationSystem(RotationSystem):
     """SRS includes specification for piece spawning positions and rotation kick checks."""
@@ -5,6 +5,9 @@ from rotation import Rotation
 # Cells with a corresponding Tetromino
 tetromino_cells = {Cell.I, Cell.J, Cell.L, Cell.O, Cell.S, Cell.T, Cell.Z}
 
+# Row length of Tetromino.mask, the width of a Field
+MASK_WIDTH = 10
+
 
 ########################
 # 5x5 matrix utilities #
@@ -84,6 +87,20 @@ class Tetromino:
         self.rotation = rotation
         self.matrix = matrix
 
+        # Collision data, computed once so that collision tests are a few masked ANDs.
+        # ROW_MASKS is a tuple of (matrix_row, bitmask) pairs for each nonempty row of my matrix where bit i of
+        # a bitmask is matrix column i. MASK sets bit MASK_WIDTH * row + column for each of my nonempty Cells.
+        # BOUNDING_BOX is a tuple (min_row, max_row, min_column, max_column) of my nonempty Cells.
+        # SKIRT is a tuple of (matrix_column, matrix_row) pairs of my bottommost nonempty Cell in each column.
+        self.nonempty_coords = frozenset((r, c) for r in range(5) for c in range(5) if matrix[r][c])
+        rows = sorted({row for row, _ in self.nonempty_coords})
+        columns = [column for _, column in self.nonempty_coords]
+        self.row_masks = tuple((row, sum(1 << c for r, c in self.nonempty_coords if r == row)) for row in rows)
+        self.bounding_box = (rows[0], rows[-1], min(columns), max(columns))
+        self.mask = sum(row_mask << row * MASK_WIDTH for row, row_mask in self.row_masks)
+        self.skirt = tuple((column, max(r for r, c in self.nonempty_coords if c == column))
+                           for column in sorted(set(columns)))
+
     def __eq__(self, other):
         assert isinstance(other, Tetromino)
         return self.cell is other.cell and self.rotation is other.rotation
@@ -132,13 +149,7 @@ class Tetromino:
         └───┴───┴───┴───┴───┘
           0   1   2   3   4   Columns
         """
-        nonempty_cells = set()
-        for r in range(5):
-            row = self.matrix[r]
-            for c in range(5):
-                if row[c]:
-                    nonempty_cells.add((r, c))
-        return nonempty_cells
+        return set(self.nonempty_coords)
 
 
 # Generate all possible Tetrominos in all possible rotation states